@@ -243,8 +243,10 @@ async def update_viewing_calendar_event(
             )
         
         # Update calendar event
+        # The viewing row already carries the event ID, so the service needn't re-read it
         result = await google_calendar_service.update_viewing_event(
-            agent_id, viewing_id, viewing_data
+            agent_id, viewing_id, viewing_data,
+            calendar_event_id=viewing_data.get("google_calendar_event_id") or ""
         )
         
         return {
@@ -306,8 +308,11 @@ async def disconnect_google_calendar(
         supabase_client.table("agents").update({
             "google_calendar_id": None,
             "google_credentials": None,
+            "google_access_token": None,
+            "google_access_token_expires_at": None,
             "updated_at": datetime.utcnow().isoformat()
         }).eq("id", agent_id).execute()
+        google_calendar_service.invalidate_agent_credentials(agent_id)
         
         # Clear agent availability data
         supabase_client.table("agent_availability").delete().eq("agent_id", agent_id).execute()
@@ -5,11 +5,14 @@ File upload routes for S3 integration
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from typing import List
 import logging
+import os
 
 from app.models.schemas import (
-    ImageUploadResponse, PresignedUploadRequest, PresignedUploadResponse, SuccessResponse
+    ImageUploadResponse, PresignedUploadRequest, PresignedUploadResponse,
+    PresignedUploadConfirmRequest, SuccessResponse
 )
 from app.services.storage_service import storage_service
+from app.services.cache_service import cache_service
 from app.api.dependencies import get_current_user, verify_property_ownership
 
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ async def upload_property_images(
     files: List[UploadFile] = File(...),
     current_user: dict = Depends(get_current_user)
 ):
-    """Upload multiple images for a property"""
+    """Upload multiple images for a property through the API (prefer presigned uploads)"""
     try:
         # Verify property ownership
         property_data = await verify_property_ownership(property_id, current_user)
@@ -35,7 +38,7 @@ async def upload_property_images(
                 detail="Maximum 10 images allowed per upload"
             )
         
-        upload_results = []
+        files_data = []
         
         for file in files:
             # Validate file type
@@ -45,29 +48,37 @@ async def upload_property_images(
                     detail=f"Invalid file type: {file.filename}. Only images are allowed."
                 )
             
-            # Read file content
-            file_content = await file.read()
+            # Measure the spooled upload rather than reading it into memory
+            file.file.seek(0, os.SEEK_END)
+            file_size = file.file.tell()
+            file.file.seek(0)
             
             # Validate file size (10MB limit)
-            if len(file_content) > 10 * 1024 * 1024:
+            if file_size > 10 * 1024 * 1024:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File too large: {file.filename}. Maximum size is 10MB."
                 )
             
-            # Upload to S3
-            upload_result = await storage_service.upload_property_image(
-                file_content=file_content,
-                user_id=current_user["id"],
-                property_id=property_id,
-                filename=file.filename or "image.jpg",
-                content_type=file.content_type
-            )
-            
+            files_data.append({
+                "content": file.file,
+                "filename": file.filename or "image.jpg",
+                "content_type": file.content_type
+            })
+        
+        # Upload to S3 concurrently
+        upload_results = []
+        batch_results = await storage_service.upload_multiple_images(
+            files_data,
+            user_id=current_user["id"],
+            property_id=property_id
+        )
+        
+        for file_data, upload_result in zip(files_data, batch_results):
             if upload_result.get("error"):
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to upload {file.filename}: {upload_result['error']}"
+                    detail=f"Failed to upload {file_data['filename']}: {upload_result['error']}"
                 )
             
             upload_results.append(ImageUploadResponse(**upload_result))
@@ -77,14 +88,17 @@ async def upload_property_images(
         
         # Get current images
         current_images = property_data.get("images", [])
+        # Re-uploaded images resolve to the same content-addressed URL, so only add new ones
         new_image_urls = [result.url for result in upload_results]
-        updated_images = current_images + new_image_urls
+        updated_images = list(dict.fromkeys(current_images + new_image_urls))
         
         # Update property
         supabase_client.table("properties").update({
             "images": updated_images
         }).eq("id", property_id).execute()
         
+        await cache_service.invalidate_property_images(current_user["id"], property_id)
+        
         return upload_results
         
     except HTTPException:
@@ -141,6 +155,52 @@ async def get_presigned_upload_url(
         )
 
 
+@router.post("/property/{property_id}/presigned-upload/confirm", response_model=ImageUploadResponse)
+async def confirm_presigned_upload(
+    property_id: str,
+    request: PresignedUploadConfirmRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Record an image uploaded directly to S3 with a presigned URL on the property"""
+    try:
+        # Verify property ownership
+        property_data = await verify_property_ownership(property_id, current_user)
+        
+        result = await storage_service.confirm_presigned_upload(
+            s3_key=request.s3_key,
+            user_id=current_user["id"],
+            property_id=property_id
+        )
+        
+        if result.get("error"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=result["error"]
+            )
+        
+        # Update property images in database
+        from app.core.supabase_client import supabase_client
+        
+        current_images = property_data.get("images", [])
+        if result["url"] not in current_images:
+            supabase_client.table("properties").update({
+                "images": current_images + [result["url"]]
+            }).eq("id", property_id).execute()
+        
+        await cache_service.invalidate_property_images(current_user["id"], property_id)
+        
+        return ImageUploadResponse(**result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Presigned upload confirmation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to confirm upload"
+        )
+
+
 @router.get("/property/{property_id}/images")
 async def get_property_images(
     property_id: str,
@@ -151,11 +211,15 @@ async def get_property_images(
         # Verify property ownership
         await verify_property_ownership(property_id, current_user)
         
-        # Get images from S3
-        images = await storage_service.get_property_images(
-            user_id=current_user["id"],
-            property_id=property_id
-        )
+        # Listings rarely change, so serve them from cache before asking S3
+        images = await cache_service.get_property_images(current_user["id"], property_id)
+        if images is None:
+            # Get images from S3
+            images = await storage_service.get_property_images(
+                user_id=current_user["id"],
+                property_id=property_id
+            )
+            await cache_service.cache_property_images(current_user["id"], property_id, images)
         
         return {"images": images}
         
@@ -192,12 +256,14 @@ async def delete_property_image(
                 detail=delete_result.get("error", "Failed to delete image")
             )
         
+        await cache_service.invalidate_property_images(current_user["id"], property_id)
+        
         # Update property images in database
         from app.core.supabase_client import supabase_client
         
         current_images = property_data.get("images", [])
         # Remove the deleted image URL from the list
-        image_url = f"https://{storage_service.bucket_name}.s3.{storage_service.region}.amazonaws.com/{s3_key}"
+        image_url = storage_service.public_url(s3_key)
         updated_images = [img for img in current_images if img != image_url]
         
         supabase_client.table("properties").update({
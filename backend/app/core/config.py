@@ -52,6 +52,10 @@ class Settings(BaseSettings):
     docusign_integrator_key: Optional[str] = None
     docusign_user_id: Optional[str] = None
     docusign_account_id: Optional[str] = None
+    docusign_private_key: Optional[str] = None
+    docusign_hmac_key: Optional[str] = None
+    # Accept Connect webhooks without an HMAC key configured (local testing only)
+    docusign_allow_unsigned_webhooks: bool = False
     docusign_base_url: str = "https://demo.docusign.net"
     docusign_app_name: str = "kribz"
     
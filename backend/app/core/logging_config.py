@@ -0,0 +1,77 @@
+"""
+Non-blocking log output: records are queued by the caller and written to stdout by a
+background thread, so the event loop never waits on a contended stdout pipe
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s [%(process)d] [%(levelname)s] %(name)s: %(message)s"
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_queue_handlers: "weakref.WeakSet[QueueHandler]" = weakref.WeakSet()
+
+
+def _start_listener():
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+        _listener.start()
+
+
+def stop_listener():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener_after_fork():
+    # The writer thread does not survive fork (e.g. gunicorn workers), so give the child its own.
+    # It also gets a fresh queue: records pending at fork time are the parent's to write, and the
+    # inherited queue's internal state may belong to the parent's (now missing) writer thread
+    global _listener, _log_queue
+    if _listener is not None:
+        _listener = None
+        _log_queue = queue.SimpleQueue()
+        for handler in _queue_handlers:
+            handler.queue = _log_queue
+        _start_listener()
+
+
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
+atexit.register(stop_listener)
+
+
+def queue_handler() -> QueueHandler:
+    """Handler that enqueues records for the stdout writer thread (also usable as a dictConfig factory)"""
+    _start_listener()
+    handler = QueueHandler(_log_queue)
+    _queue_handlers.add(handler)
+    return handler
+
+
+def setup_logging(level: int = logging.INFO):
+    """Route the root and uvicorn loggers through the log queue"""
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return  # Already wired, e.g. by gunicorn's logconfig_dict
+
+    handler = queue_handler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.handlers = [handler]
+    root.setLevel(level)
+
+    # Let uvicorn's own loggers propagate to the queue instead of writing to stdout directly
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
@@ -394,6 +394,7 @@ class ImageUploadResponse(BaseModel):
     s3_key: str
     size: int
     content_type: str
+    urls: Optional[Dict[str, str]] = None  # Size variant label -> URL
 
 
 class PresignedUploadRequest(BaseModel):
@@ -409,6 +410,10 @@ class PresignedUploadResponse(BaseModel):
     s3_key: str
 
 
+class PresignedUploadConfirmRequest(BaseModel):
+    s3_key: str
+
+
 # Analytics Models
 class PropertyAnalytics(BaseModel):
     property_id: str
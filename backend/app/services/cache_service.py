@@ -20,6 +20,7 @@ class CacheService:
         "financial_summary": 300,   # 5 minutes
         "bookings": 120,           # 2 minutes
         "property_details": 600,    # 10 minutes
+        "property_images": 300,     # 5 minutes
         "search_results": 180,      # 3 minutes
     }
     
@@ -83,6 +84,28 @@ class CacheService:
         cache_key = get_property_cache_key(property_id, "details")
         await redis_client.delete(cache_key)
     
+    @staticmethod
+    async def cache_property_images(user_id: str, property_id: str, images: List[Dict[str, Any]]) -> bool:
+        """Cache a property's S3 image listing"""
+        cache_key = get_property_cache_key(property_id, "images", user_id)
+        return await redis_client.set(
+            cache_key, 
+            images, 
+            expire=CacheService.CACHE_TIMES["property_images"]
+        )
+    
+    @staticmethod
+    async def get_property_images(user_id: str, property_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached property image listing"""
+        cache_key = get_property_cache_key(property_id, "images", user_id)
+        return await redis_client.get(cache_key, default=None)
+    
+    @staticmethod
+    async def invalidate_property_images(user_id: str, property_id: str):
+        """Invalidate property image listing cache"""
+        cache_key = get_property_cache_key(property_id, "images", user_id)
+        await redis_client.delete(cache_key)
+    
     @staticmethod
     async def cache_analytics_data(user_id: str, period: str, analytics_data: Dict[str, Any]) -> bool:
         """Cache analytics data for user"""
@@ -2,20 +2,37 @@
 DocuSign Integration Service for Lease Agreement Management
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union, AsyncIterator
 import json
 import base64
+import copy
+import hashlib
+import hmac
 import logging
-from datetime import datetime
+import asyncio
+import functools
+import mmap
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import os
 
+import httpx
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+
 from app.core.config import settings
 from app.core.supabase_client import supabase_client
+from app.services.storage_service import storage_service
 
 # Try to import DocuSign libraries, but continue if they're not available
 try:
     from docusign_esign import ApiClient, EnvelopesApi, EnvelopeDefinition, Document, Signer, SignHere, Tabs, Recipients
     from docusign_esign.rest import ApiException
+    import certifi
+    import urllib3
+    from urllib3.util.retry import Retry
     DOCUSIGN_AVAILABLE = True
 except ImportError:
     # Create mock classes if DocuSign is not available
@@ -32,11 +49,131 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Tokens inside this window of their expiry are "stale": still served, but refreshed in the background
+TOKEN_REFRESH_MARGIN = 300  # seconds
+TOKEN_LIFETIME = 3600  # seconds
+
+# Connections kept alive to the DocuSign API, shared by all envelope calls
+DOCUSIGN_POOL_MAXSIZE = 32
+
+# The DocuSign SDK is synchronous; its calls run here so they don't block the event loop
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="docusign")
+
+# DocuSign allows 1,000 API calls per account per hour and one status poll per envelope per 15 minutes
+RATE_LIMIT_PER_HOUR = 1000
+RATE_LIMIT_LOW_WATERMARK = 50
+STATUS_CACHE_TTL = 900  # seconds
+
+# Signers in routing order: (role, recipient_id, sign-here y position, default email, default name)
+_SIGNER_LAYOUT = (
+    ("landlord", "1", "100", None, None),
+    ("tenant", "2", "200", None, None),
+    ("witness", "3", "300", "witness@agency.com", "Agency Witness"),
+)
+
+# Lease envelope request body; only names, emails and the document vary per lease, so the
+# JSON is posted directly instead of being built through the SDK's validated model objects
+_LEASE_ENVELOPE_TEMPLATE = {
+    "emailBlurb": "Please review and sign the lease agreement",
+    "status": "sent",
+    "documents": [{"documentId": "1", "fileExtension": "pdf"}],
+    "recipients": {"signers": []}
+}
+
+_SIGNER_TEMPLATES = {
+    role: {
+        "recipientId": recipient_id,
+        "routingOrder": recipient_id,
+        "tabs": {
+            "signHereTabs": [{
+                "documentId": "1",
+                "pageNumber": "1",
+                "xPosition": "100",
+                "yPosition": y_position,
+                "tabLabel": f"{role}_signature"
+            }]
+        }
+    }
+    for role, recipient_id, y_position, _, _ in _SIGNER_LAYOUT
+}
+
+# Concurrent status polls are gathered for this long and sent as one listStatusChanges call
+STATUS_BATCH_WINDOW = 0.05  # seconds
+STATUS_BATCH_SIZE = 100  # envelope IDs per request, keeps the query string a sane length
+
+# Envelope -> lease lookups are stable for the envelope's lifetime, so webhook bursts can reuse them
+LEASE_LOOKUP_CACHE_TTL = 3600  # seconds
+
+# Webhook events that change a lease agreement; anything else is acknowledged without a lookup
+_ACTIONABLE_EVENTS = frozenset({
+    "envelope-completed",
+    "envelope-declined",
+    "envelope-voided",
+    "recipient-completed"
+})
+
+# Signed documents are streamed in chunks and spooled to disk past this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOCUMENT_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Webhook updates for the same lease arriving within this window are written together
+LEASE_UPDATE_FLUSH_INTERVAL = 0.2  # seconds
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _encode_document(content: Union[str, bytes, os.PathLike]) -> str:
+    """
+    Base64-encode a document for an envelope.
+    Accepts text, raw bytes, or a file path (memory-mapped rather than read into memory)
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    elif isinstance(content, os.PathLike):
+        with open(content, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return base64.b64encode(mapped).decode("ascii")
+    
+    # base64 output is pure ASCII, so skip the UTF-8 codec
+    return base64.b64encode(content).decode("ascii")
+
+
 class DocuSignService:
     def __init__(self):
         self.api_client = None
+        self._envelopes_api = None
+        self._http_client = None
         self.docusign_available = DOCUSIGN_AVAILABLE
         
+        # Cached access token state (minted lazily on first use)
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._refresh_in_flight = False
+        
+        # Account-wide rate limiting and per-envelope status caching
+        self._limiter = AsyncLimiter(RATE_LIMIT_PER_HOUR, 3600)
+        self._rate_limit_resume_at = 0.0
+        self._status_cache: TTLCache = TTLCache(maxsize=10_000, ttl=STATUS_CACHE_TTL)
+        self._recipients_cache: TTLCache = TTLCache(maxsize=10_000, ttl=STATUS_CACHE_TTL)
+        self._status_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._status_batch_task: Optional[asyncio.Task] = None
+        self._lease_by_envelope: TTLCache = TTLCache(maxsize=50_000, ttl=LEASE_LOOKUP_CACHE_TTL)
+        
+        # Webhook lease updates waiting to be written, merged per lease_id, and the webhook
+        # calls waiting for each lease's write to land before they acknowledge
+        self._pending_lease_updates: Dict[str, Dict[str, Any]] = {}
+        self._lease_update_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._lease_flush_task: Optional[asyncio.Task] = None
+        self._pending_updates: set = set()
+        
+        if not getattr(settings, 'docusign_hmac_key', None):
+            if getattr(settings, 'docusign_allow_unsigned_webhooks', False):
+                logger.warning("DOCUSIGN_HMAC_KEY not set. Accepting unsigned DocuSign webhooks (DOCUSIGN_ALLOW_UNSIGNED_WEBHOOKS).")
+            else:
+                logger.warning("DOCUSIGN_HMAC_KEY not set. DocuSign webhooks will be rejected.")
+        
         if not self.docusign_available:
             logger.warning("DocuSign library not available. DocuSign features will be disabled.")
             return
@@ -49,32 +186,121 @@ class DocuSignService:
         if self.integrator_key and self.user_id and self.account_id:
             try:
                 self.api_client = ApiClient(base_path=self.base_url + "/restapi")
-                self.api_client.set_default_header("Authorization", f"Bearer {self._get_access_token()}")
+                # Replace the SDK's default pool so TLS connections are reused across requests
+                self.api_client.rest_client.pool_manager = urllib3.PoolManager(
+                    num_pools=4,
+                    maxsize=DOCUSIGN_POOL_MAXSIZE,
+                    block=False,
+                    cert_reqs="CERT_REQUIRED",
+                    ca_certs=certifi.where(),
+                    retries=Retry(total=3, backoff_factor=0.2)
+                )
+                self._envelopes_api = EnvelopesApi(self.api_client)
+                # Used for endpoints streamed outside the SDK (document downloads)
+                self._http_client = httpx.AsyncClient(timeout=60.0)
                 logger.info("DocuSign client initialized successfully")
+                if not getattr(settings, 'docusign_private_key', None):
+                    logger.warning("DOCUSIGN_PRIVATE_KEY not set. DocuSign API calls will fail until it is configured.")
             except Exception as e:
                 logger.warning(f"Failed to initialize DocuSign client: {e}")
                 self.api_client = None
         else:
             logger.warning("DocuSign configuration incomplete. DocuSign features will be disabled.")
     
-    def _get_access_token(self) -> str:
+    def _get_access_token(self) -> Tuple[str, float]:
         """
         Get DocuSign access token using JWT authentication
-        In production, implement proper OAuth2 JWT authentication
+        Returns the token and its absolute expiry timestamp
+        """
+        private_key = getattr(settings, 'docusign_private_key', None)
+        if not private_key:
+            raise Exception("DocuSign private key not configured")
+        
+        oauth_host = "account-d.docusign.com" if "demo" in self.base_url else "account.docusign.com"
+        token = self.api_client.request_jwt_user_token(
+            client_id=self.integrator_key,
+            user_id=self.user_id,
+            oauth_host_name=oauth_host,
+            private_key_bytes=private_key.encode(),
+            expires_in=TOKEN_LIFETIME,
+            scopes=["signature", "impersonation"]
+        )
+        return token.access_token, time.time() + int(token.expires_in)
+    
+    async def _refresh_token(self):
+        """Mint a new access token, coalescing concurrent refreshes into one"""
+        try:
+            async with self._token_lock:
+                # Another coroutine may have refreshed while we waited for the lock
+                if time.time() < self._token_expires_at - TOKEN_REFRESH_MARGIN:
+                    return
+                self._access_token, self._token_expires_at = await asyncio.get_running_loop().run_in_executor(
+                    _executor, self._get_access_token
+                )
+        finally:
+            self._refresh_in_flight = False
+    
+    async def _get_auth_header(self) -> str:
+        """Return the Authorization header, refreshing the cached token as needed"""
+        now = time.time()
+        if now >= self._token_expires_at:
+            # Expired (or never minted): the caller has to wait for a new token
+            await self._refresh_token()
+        elif now >= self._token_expires_at - TOKEN_REFRESH_MARGIN and not self._refresh_in_flight:
+            # Stale: keep serving the current token and refresh in the background
+            self._refresh_in_flight = True
+            refresh_task = asyncio.create_task(self._refresh_token())
+            refresh_task.add_done_callback(self._log_refresh_failure)
+        
+        return f"Bearer {self._access_token}"
+    
+    async def _call_envelopes_api(self, method_name: str, **kwargs):
+        """Call an EnvelopesApi method for the configured account"""
+        method = getattr(self._envelopes_api, f"{method_name}_with_http_info")
+        return await self._run_api_call(
+            functools.partial(method, account_id=self.account_id, **kwargs)
+        )
+    
+    async def _run_api_call(self, api_call):
+        """
+        Run a blocking SDK call returning (data, status, headers) on the DocuSign thread pool
+        with a current token, staying within the account rate limit
         """
-        # TODO: Implement proper JWT authentication for DocuSign
-        # For now, return a placeholder token
-        # In production, you would:
-        # 1. Generate JWT token using private key
-        # 2. Exchange JWT for access token
-        # 3. Cache and refresh tokens as needed
-        return "placeholder_token"
+        await self._wait_for_rate_limit()
+        
+        async with self._limiter:
+            self.api_client.set_default_header("Authorization", await self._get_auth_header())
+            loop = asyncio.get_running_loop()
+            data, _status, headers = await loop.run_in_executor(_executor, api_call)
+        
+        self._record_rate_limit(headers)
+        return data
+    
+    async def _wait_for_rate_limit(self):
+        """Back off until the reset time once DocuSign reports we're close to the limit"""
+        delay = self._rate_limit_resume_at - time.time()
+        if delay > 0:
+            logger.warning(f"DocuSign rate limit nearly exhausted, waiting {delay:.0f}s")
+            await asyncio.sleep(delay)
+    
+    def _record_rate_limit(self, headers):
+        """Track DocuSign's X-RateLimit headers so later calls can back off"""
+        remaining = headers.get("X-RateLimit-Remaining") if headers else None
+        reset = headers.get("X-RateLimit-Reset") if headers else None
+        if remaining is not None and reset is not None and int(remaining) < RATE_LIMIT_LOW_WATERMARK:
+            self._rate_limit_resume_at = float(reset)
+    
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task):
+        """Surface errors from background token refreshes"""
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background DocuSign token refresh failed: {task.exception()}")
     
     async def create_lease_agreement_envelope(
         self,
         lease_id: str,
         lease_data: Dict[str, Any],
-        contract_content: str
+        contract_content: Union[str, bytes, os.PathLike]
     ) -> Dict[str, Any]:
         """
         Create a DocuSign envelope for lease agreement signing
@@ -91,40 +317,41 @@ class DocuSignService:
             if not self.api_client:
                 raise Exception("DocuSign client not initialized")
             
-            # Create envelope definition
-            envelope_definition = EnvelopeDefinition()
-            envelope_definition.email_subject = f"Lease Agreement - {lease_data['property_title']}"
-            envelope_definition.email_blurb = "Please review and sign the lease agreement"
+            # Fill in the envelope template (status 'sent' sends it immediately)
+            envelope_definition = copy.deepcopy(_LEASE_ENVELOPE_TEMPLATE)
+            envelope_definition["emailSubject"] = f"Lease Agreement - {lease_data['property_title']}"
             
-            # Create document from contract content
-            document = Document()
-            document.document_base64 = base64.b64encode(contract_content.encode()).decode()
-            document.name = f"Lease_Agreement_{lease_id}.pdf"
-            document.file_extension = "pdf"
-            document.document_id = "1"
+            document = envelope_definition["documents"][0]
+            document["documentBase64"] = _encode_document(contract_content)
+            document["name"] = f"Lease_Agreement_{lease_id}.pdf"
             
-            envelope_definition.documents = [document]
-            
-            # Create signers
-            signers = self._create_signers(lease_data)
-            
-            # Create recipients
-            recipients = Recipients()
-            recipients.signers = signers
-            envelope_definition.recipients = recipients
-            
-            # Set envelope status to 'sent' to send immediately
-            envelope_definition.status = "sent"
+            envelope_definition["recipients"]["signers"] = self._create_signers(lease_data)
             
             # Create envelope
-            envelopes_api = EnvelopesApi(self.api_client)
-            envelope_summary = envelopes_api.create_envelope(
-                account_id=self.account_id,
-                envelope_definition=envelope_definition
+            envelope_summary = await self._run_api_call(functools.partial(
+                self.api_client.call_api,
+                "/v2.1/accounts/{accountId}/envelopes",
+                "POST",
+                path_params={"accountId": self.account_id},
+                header_params={"Accept": "application/json", "Content-Type": "application/json"},
+                body=envelope_definition,
+                response_type="EnvelopeSummary",
+                auth_settings=[]
+            ))
+            
+            # Record the envelope ID on the lease without holding up the response
+            update_task = asyncio.create_task(
+                self._update_lease_with_envelope_id(lease_id, envelope_summary.envelope_id)
             )
-            
-            # Update lease agreement with DocuSign envelope ID
-            await self._update_lease_with_envelope_id(lease_id, envelope_summary.envelope_id)
+            self._pending_updates.add(update_task)
+            update_task.add_done_callback(self._pending_updates.discard)
+            
+            # Remember the signers so webhooks for this envelope can skip the lease lookup
+            self._lease_by_envelope[envelope_summary.envelope_id] = {
+                "id": lease_id,
+                "landlord_email": lease_data.get("landlord_email"),
+                "tenant_email": lease_data.get("tenant_email")
+            }
             
             return {
                 "envelope_id": envelope_summary.envelope_id,
@@ -139,83 +366,55 @@ class DocuSignService:
             logger.error(f"DocuSign service error: {e}")
             raise
     
-    def _create_signers(self, lease_data: Dict[str, Any]) -> List[Signer]:
-        """Create DocuSign signers for lease agreement"""
+    def _create_signers(self, lease_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Create DocuSign signer definitions for lease agreement"""
         signers = []
         
-        # Landlord signer
-        landlord = Signer()
-        landlord.email = lease_data.get("landlord_email")
-        landlord.name = lease_data.get("landlord_name")
-        landlord.recipient_id = "1"
-        landlord.routing_order = "1"
-        
-        # Add signature tabs for landlord
-        landlord_sign_here = SignHere()
-        landlord_sign_here.document_id = "1"
-        landlord_sign_here.page_number = "1"
-        landlord_sign_here.x_position = "100"
-        landlord_sign_here.y_position = "100"
-        landlord_sign_here.tab_label = "landlord_signature"
-        
-        landlord_tabs = Tabs()
-        landlord_tabs.sign_here_tabs = [landlord_sign_here]
-        landlord.tabs = landlord_tabs
-        
-        signers.append(landlord)
-        
-        # Tenant signer
-        tenant = Signer()
-        tenant.email = lease_data.get("tenant_email")
-        tenant.name = lease_data.get("tenant_name")
-        tenant.recipient_id = "2"
-        tenant.routing_order = "2"
-        
-        # Add signature tabs for tenant
-        tenant_sign_here = SignHere()
-        tenant_sign_here.document_id = "1"
-        tenant_sign_here.page_number = "1"
-        tenant_sign_here.x_position = "100"
-        tenant_sign_here.y_position = "200"
-        tenant_sign_here.tab_label = "tenant_signature"
-        
-        tenant_tabs = Tabs()
-        tenant_tabs.sign_here_tabs = [tenant_sign_here]
-        tenant.tabs = tenant_tabs
-        
-        signers.append(tenant)
-        
-        # Witness signer (if required)
-        if lease_data.get("witness_required", True):
-            witness = Signer()
-            witness.email = lease_data.get("witness_email", "witness@agency.com")
-            witness.name = lease_data.get("witness_name", "Agency Witness")
-            witness.recipient_id = "3"
-            witness.routing_order = "3"
-            
-            # Add signature tabs for witness
-            witness_sign_here = SignHere()
-            witness_sign_here.document_id = "1"
-            witness_sign_here.page_number = "1"
-            witness_sign_here.x_position = "100"
-            witness_sign_here.y_position = "300"
-            witness_sign_here.tab_label = "witness_signature"
-            
-            witness_tabs = Tabs()
-            witness_tabs.sign_here_tabs = [witness_sign_here]
-            witness.tabs = witness_tabs
-            
-            signers.append(witness)
+        for role, _, _, default_email, default_name in _SIGNER_LAYOUT:
+            # Witness signer only if required
+            if role == "witness" and not lease_data.get("witness_required", True):
+                continue
+            
+            signer = copy.deepcopy(_SIGNER_TEMPLATES[role])
+            signer["email"] = lease_data.get(f"{role}_email", default_email)
+            signer["name"] = lease_data.get(f"{role}_name", default_name)
+            signers.append(signer)
         
         return signers
     
+    @staticmethod
+    def _build_signer(
+        role: str,
+        recipient_id: str,
+        y_position: str,
+        email: Optional[str],
+        name: Optional[str],
+        role_name: Optional[str] = None
+    ) -> Signer:
+        """Create a signer with a single sign-here tab on the first page"""
+        sign_here = SignHere(
+            document_id="1",
+            page_number="1",
+            x_position="100",
+            y_position=y_position,
+            tab_label=f"{role}_signature"
+        )
+        return Signer(
+            email=email,
+            name=name,
+            recipient_id=recipient_id,
+            routing_order=recipient_id,
+            role_name=role_name,
+            tabs=Tabs(sign_here_tabs=[sign_here])
+        )
+    
     async def _update_lease_with_envelope_id(self, lease_id: str, envelope_id: str):
         """Update lease agreement with DocuSign envelope ID"""
         try:
             supabase_client.table("lease_agreements").update({
                 "docusign_envelope_id": envelope_id,
                 "status": "sent_for_signature",
-                "updated_at": datetime.utcnow().isoformat()
+                "updated_at": _now_iso()
             }).eq("id", lease_id).execute()
         except Exception as e:
             logger.error(f"Failed to update lease with envelope ID: {e}")
@@ -225,30 +424,29 @@ class DocuSignService:
         try:
             if not self.docusign_available:
                 logger.warning("DocuSign not available, returning mock status")
+                now_iso = _now_iso()
                 return {
                     "envelope_id": envelope_id,
                     "status": "mock_completed",
-                    "created_date": datetime.utcnow().isoformat(),
-                    "completed_date": datetime.utcnow().isoformat(),
+                    "created_date": now_iso,
+                    "completed_date": now_iso,
                     "voided_date": None
                 }
             
             if not self.api_client:
                 raise Exception("DocuSign client not initialized")
             
-            envelopes_api = EnvelopesApi(self.api_client)
-            envelope = envelopes_api.get_envelope(
-                account_id=self.account_id,
-                envelope_id=envelope_id
-            )
+            cached = self._status_cache.get(envelope_id)
+            if cached is not None:
+                return cached
             
-            return {
-                "envelope_id": envelope.envelope_id,
-                "status": envelope.status,
-                "created_date": envelope.created_date_time,
-                "completed_date": envelope.completed_date_time,
-                "voided_date": envelope.voided_date_time
-            }
+            # Join the next status batch rather than polling this envelope on its own
+            waiter = asyncio.get_running_loop().create_future()
+            self._status_waiters.setdefault(envelope_id, []).append(waiter)
+            if self._status_batch_task is None or self._status_batch_task.done():
+                self._status_batch_task = asyncio.create_task(self._poll_status_batches())
+            
+            return await waiter
             
         except ApiException as e:
             logger.error(f"DocuSign API error getting envelope status: {e}")
@@ -257,11 +455,54 @@ class DocuSignService:
             logger.error(f"DocuSign service error: {e}")
             raise
     
+    async def _poll_status_batches(self):
+        """Resolve queued status requests with one listStatusChanges call per batch of envelopes"""
+        while self._status_waiters:
+            await asyncio.sleep(STATUS_BATCH_WINDOW)
+            waiters, self._status_waiters = self._status_waiters, {}
+            envelope_ids = list(waiters)
+            
+            for start in range(0, len(envelope_ids), STATUS_BATCH_SIZE):
+                batch = envelope_ids[start:start + STATUS_BATCH_SIZE]
+                try:
+                    result = await self._call_envelopes_api(
+                        "list_status_changes",
+                        envelope_ids=",".join(batch)
+                    )
+                    envelopes = {envelope.envelope_id: envelope for envelope in (result.envelopes or [])}
+                except Exception as e:
+                    for envelope_id in batch:
+                        for waiter in waiters[envelope_id]:
+                            if not waiter.done():
+                                waiter.set_exception(e)
+                    continue
+                
+                for envelope_id in batch:
+                    envelope = envelopes.get(envelope_id)
+                    if envelope is not None:
+                        envelope_status = {
+                            "envelope_id": envelope.envelope_id,
+                            "status": envelope.status,
+                            "created_date": envelope.created_date_time,
+                            "completed_date": envelope.completed_date_time,
+                            "voided_date": envelope.voided_date_time
+                        }
+                        self._status_cache[envelope_id] = envelope_status
+                    
+                    for waiter in waiters[envelope_id]:
+                        if waiter.done():
+                            continue
+                        if envelope is None:
+                            waiter.set_exception(Exception(f"Envelope not found: {envelope_id}"))
+                        else:
+                            waiter.set_result(envelope_status)
+    
     async def get_envelope_recipients(self, envelope_id: str) -> List[Dict[str, Any]]:
         """Get the recipients and their signing status for an envelope"""
         try:
             if not self.docusign_available:
                 logger.warning("DocuSign not available, returning mock recipients")
+                now_iso = _now_iso()
                 return [
                     {
                         "recipient_id": "1",
@@ -269,8 +510,8 @@ class DocuSignService:
                         "email": "landlord@example.com",
                         "status": "completed",
                         "type": "signer",
-                        "signed_date": datetime.utcnow().isoformat(),
-                        "delivered_date": datetime.utcnow().isoformat()
+                        "signed_date": now_iso,
+                        "delivered_date": now_iso
                     },
                     {
                         "recipient_id": "2",
@@ -278,17 +519,20 @@ class DocuSignService:
                         "email": "tenant@example.com",
                         "status": "completed",
                         "type": "signer",
-                        "signed_date": datetime.utcnow().isoformat(),
-                        "delivered_date": datetime.utcnow().isoformat()
+                        "signed_date": now_iso,
+                        "delivered_date": now_iso
                     }
                 ]
             
             if not self.api_client:
                 raise Exception("DocuSign client not initialized")
             
-            envelopes_api = EnvelopesApi(self.api_client)
-            recipients = envelopes_api.list_recipients(
-                account_id=self.account_id,
+            cached = self._recipients_cache.get(envelope_id)
+            if cached is not None:
+                return cached
+            
+            recipients = await self._call_envelopes_api(
+                "list_recipients",
                 envelope_id=envelope_id
             )
             
@@ -307,6 +551,8 @@ class DocuSignService:
                         "delivered_date": signer.delivered_date_time
                     })
             
+            self._recipients_cache[envelope_id] = recipient_list
+            
             return recipient_list
             
         except ApiException as e:
@@ -316,53 +562,103 @@ class DocuSignService:
             logger.error(f"DocuSign service error: {e}")
             raise
     
-    async def download_completed_document(self, envelope_id: str) -> bytes:
-        """Download the completed and signed document"""
+    async def download_completed_document(self, envelope_id: str) -> AsyncIterator[bytes]:
+        """Stream the completed and signed document in chunks"""
+        if not self.docusign_available:
+            logger.warning("DocuSign not available, returning mock document")
+            mock_content = f"Mock signed document for envelope {envelope_id}"
+            yield mock_content.encode('utf-8')
+            return
+        
+        if not self.api_client:
+            raise Exception("DocuSign client not initialized")
+        
+        # Download combined document (all documents in one PDF)
+        url = f"{self.base_url}/restapi/v2.1/accounts/{self.account_id}/envelopes/{envelope_id}/documents/combined"
+        
         try:
-            if not self.docusign_available:
-                logger.warning("DocuSign not available, returning mock document")
-                mock_content = f"Mock signed document for envelope {envelope_id}"
-                return mock_content.encode('utf-8')
+            await self._wait_for_rate_limit()
+            async with self._limiter:
+                headers = {"Authorization": await self._get_auth_header()}
             
-            if not self.api_client:
-                raise Exception("DocuSign client not initialized")
+            async with self._http_client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                self._record_rate_limit(response.headers)
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
             
-            envelopes_api = EnvelopesApi(self.api_client)
-            
-            # Download combined document (all documents in one PDF)
-            document_bytes = envelopes_api.get_document(
-                account_id=self.account_id,
-                envelope_id=envelope_id,
-                document_id="combined"
-            )
-            
-            return document_bytes
-            
-        except ApiException as e:
+        except httpx.HTTPError as e:
             logger.error(f"DocuSign API error downloading document: {e}")
             raise Exception(f"Failed to download document: {e}")
-        except Exception as e:
-            logger.error(f"DocuSign service error: {e}")
-            raise
     
-    async def process_webhook_notification(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process DocuSign webhook notification"""
+    def verify_webhook_signature(self, raw_body: bytes, signature: Optional[str]) -> bool:
+        """
+        Verify a DocuSign Connect HMAC signature (X-DocuSign-Signature-1 header)
+        Without an HMAC key every webhook is rejected, unless unsigned webhooks are explicitly allowed
+        """
+        hmac_key = getattr(settings, 'docusign_hmac_key', None)
+        if not hmac_key:
+            return bool(getattr(settings, 'docusign_allow_unsigned_webhooks', False))
+        if not signature:
+            return False
+        
+        expected = base64.b64encode(
+            hmac.new(hmac_key.encode(), raw_body, hashlib.sha256).digest()
+        ).decode("ascii")
+        return hmac.compare_digest(expected, signature)
+    
+    async def process_webhook_notification(
+        self,
+        webhook_data: Dict[str, Any],
+        raw_body: bytes,
+        signature: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Process DocuSign webhook notification
+        raw_body is the exact request body and signature the X-DocuSign-Signature-1 header
+        """
         try:
+            # Reject spoofed payloads before touching the database
+            if not self.verify_webhook_signature(raw_body, signature):
+                logger.warning("Rejected DocuSign webhook with invalid signature")
+                return {"status": "error", "message": "invalid signature"}
+            
             envelope_id = webhook_data.get("data", {}).get("envelopeId")
             event_type = webhook_data.get("event")
             
             if not envelope_id:
                 raise Exception("Envelope ID not found in webhook data")
             
-            # Find lease agreement by envelope ID
-            lease_result = supabase_client.table("lease_agreements").select("*").eq("docusign_envelope_id", envelope_id).execute()
+            # The envelope changed, so cached status/recipients are out of date
+            self._status_cache.pop(envelope_id, None)
+            self._recipients_cache.pop(envelope_id, None)
             
-            if not lease_result.data:
-                logger.warning(f"Lease agreement not found for envelope ID: {envelope_id}")
-                return {"status": "error", "message": "Lease agreement not found"}
+            if event_type not in _ACTIONABLE_EVENTS:
+                return {"status": "ignored", "event_type": event_type}
+            
+            # Find lease agreement by envelope ID
+            lease = self._lease_by_envelope.get(envelope_id)
+            
+            # Witness or unknown recipients never change the lease
+            if lease is not None and event_type == "recipient-completed":
+                recipient_email = webhook_data.get("data", {}).get("recipientEmail")
+                if recipient_email not in (lease.get("landlord_email"), lease.get("tenant_email")):
+                    return {"status": "ignored", "event_type": event_type}
+            
+            if lease is None:
+                lease_result = supabase_client.table("lease_agreements").select(
+                    "id, landlord_email, tenant_email, status"
+                ).eq("docusign_envelope_id", envelope_id).limit(1).execute()
+                
+                if not lease_result.data:
+                    logger.warning(f"Lease agreement not found for envelope ID: {envelope_id}")
+                    return {"status": "error", "message": "Lease agreement not found"}
+                
+                lease = lease_result.data[0]
+                self._lease_by_envelope[envelope_id] = lease
             
-            lease = lease_result.data[0]
             lease_id = lease["id"]
+            now = datetime.now(timezone.utc)
             
             # Process different event types
             update_data = {}
@@ -372,13 +668,14 @@ class DocuSignService:
                     "status": "fully_executed",
                     "landlord_signature_status": "signed",
                     "tenant_signature_status": "signed",
-                    "execution_date": datetime.utcnow().date().isoformat()
+                    "execution_date": now.date().isoformat()
                 })
                 
                 # Download and store signed document
                 try:
-                    document_bytes = await self.download_completed_document(envelope_id)
-                    signed_url = await self._store_signed_document(lease_id, document_bytes)
+                    signed_url = await self._store_signed_document(
+                        lease_id, self.download_completed_document(envelope_id)
+                    )
                     update_data["signed_contract_url"] = signed_url
                 except Exception as e:
                     logger.error(f"Failed to download signed document: {e}")
@@ -404,10 +701,12 @@ class DocuSignService:
                 elif recipient_email == lease.get("tenant_email"):
                     update_data["tenant_signature_status"] = "signed"
             
-            # Update lease agreement
+            # Bursts of events for one envelope become a single write, but each webhook still waits
+            # for it: DocuSign won't redeliver an event we've acknowledged, so a failed write must
+            # surface as an error rather than a success
             if update_data:
-                update_data["updated_at"] = datetime.utcnow().isoformat()
-                supabase_client.table("lease_agreements").update(update_data).eq("id", lease_id).execute()
+                update_data["updated_at"] = now.isoformat(timespec="seconds")
+                await self._write_lease_update(lease_id, update_data)
             
             return {
                 "status": "success",
@@ -420,19 +719,63 @@ class DocuSignService:
             logger.error(f"Failed to process DocuSign webhook: {e}")
             return {"status": "error", "message": str(e)}
     
-    async def _store_signed_document(self, lease_id: str, document_bytes: bytes) -> str:
+    async def drain_pending_updates(self):
+        """Wait for background lease writes to finish (called on shutdown)"""
+        pending = list(self._pending_updates)
+        if self._lease_flush_task is not None:
+            pending.append(self._lease_flush_task)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _write_lease_update(self, lease_id: str, update_data: Dict[str, Any]):
+        """Merge an update into the pending batch for a lease and wait until it is written"""
+        self._pending_lease_updates.setdefault(lease_id, {}).update(update_data)
+        waiter = asyncio.get_running_loop().create_future()
+        self._lease_update_waiters.setdefault(lease_id, []).append(waiter)
+        if self._lease_flush_task is None or self._lease_flush_task.done():
+            self._lease_flush_task = asyncio.create_task(self._flush_lease_updates())
+        await waiter
+    
+    async def _flush_lease_updates(self):
+        """Write coalesced webhook updates, one update per lease per flush window"""
+        while self._pending_lease_updates:
+            await asyncio.sleep(LEASE_UPDATE_FLUSH_INTERVAL)
+            pending, self._pending_lease_updates = self._pending_lease_updates, {}
+            waiters, self._lease_update_waiters = self._lease_update_waiters, {}
+            
+            for lease_id, update_data in pending.items():
+                try:
+                    supabase_client.table("lease_agreements").update(update_data).eq("id", lease_id).execute()
+                except Exception as e:
+                    logger.error(f"Failed to apply webhook updates to lease {lease_id}: {e}")
+                    for waiter in waiters.get(lease_id, []):
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                    continue
+                
+                for waiter in waiters.get(lease_id, []):
+                    if not waiter.done():
+                        waiter.set_result(None)
+    
+    async def _store_signed_document(self, lease_id: str, document_chunks: AsyncIterator[bytes]) -> str:
         """Store signed document in storage and return URL"""
         try:
-            # TODO: Implement document storage using Supabase Storage or S3
-            # For now, return a placeholder URL
-            filename = f"signed_lease_{lease_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
+            filename = f"signed_lease_{lease_id}_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.pdf"
             
-            # In production, upload to storage service:
-            # 1. Upload to Supabase Storage bucket
-            # 2. Get public URL
-            # 3. Return URL
+            # Spool the download so large documents go to disk instead of staying in memory
+            with tempfile.SpooledTemporaryFile(max_size=DOCUMENT_SPOOL_MAX_SIZE) as buffer:
+                async for chunk in document_chunks:
+                    buffer.write(chunk)
+                buffer.seek(0)
+                
+                result = await storage_service.upload_document(
+                    buffer, f"signed-contracts/{filename}", content_type="application/pdf"
+                )
+            
+            if not result.get("url"):
+                raise Exception(result.get("error", "Upload failed"))
             
-            return f"https://storage.example.com/signed-contracts/{filename}"
+            return result["url"]
             
         except Exception as e:
             logger.error(f"Failed to store signed document: {e}")
@@ -441,7 +784,7 @@ class DocuSignService:
     async def create_contract_template(
         self,
         template_name: str,
-        template_content: str,
+        template_content: Union[str, bytes, os.PathLike],
         description: str = ""
     ) -> Dict[str, Any]:
         """Create a DocuSign template for lease agreements"""
@@ -464,7 +807,7 @@ class DocuSignService:
             
             # Create document from template content
             document = Document()
-            document.document_base64 = base64.b64encode(template_content.encode()).decode()
+            document.document_base64 = _encode_document(template_content)
             document.name = f"{template_name}.pdf"
             document.file_extension = "pdf"
             document.document_id = "1"
@@ -480,9 +823,8 @@ class DocuSignService:
             envelope_template.status = "created"
             
             # Create template
-            envelopes_api = EnvelopesApi(self.api_client)
-            template_summary = envelopes_api.create_envelope(
-                account_id=self.account_id,
+            template_summary = await self._call_envelopes_api(
+                "create_envelope",
                 envelope_definition=envelope_template
             )
             
@@ -501,53 +843,18 @@ class DocuSignService:
     
     def _create_template_signers(self) -> List[Signer]:
         """Create template signers with placeholder information"""
-        signers = []
-        
-        # Landlord template signer
-        landlord = Signer()
-        landlord.email = "landlord@example.com"
-        landlord.name = "Landlord Name"
-        landlord.recipient_id = "1"
-        landlord.routing_order = "1"
-        landlord.role_name = "Landlord"
-        
-        # Add signature tabs
-        landlord_sign_here = SignHere()
-        landlord_sign_here.document_id = "1"
-        landlord_sign_here.page_number = "1"
-        landlord_sign_here.x_position = "100"
-        landlord_sign_here.y_position = "100"
-        landlord_sign_here.tab_label = "landlord_signature"
-        
-        landlord_tabs = Tabs()
-        landlord_tabs.sign_here_tabs = [landlord_sign_here]
-        landlord.tabs = landlord_tabs
-        
-        signers.append(landlord)
-        
-        # Tenant template signer
-        tenant = Signer()
-        tenant.email = "tenant@example.com"
-        tenant.name = "Tenant Name"
-        tenant.recipient_id = "2"
-        tenant.routing_order = "2"
-        tenant.role_name = "Tenant"
-        
-        # Add signature tabs
-        tenant_sign_here = SignHere()
-        tenant_sign_here.document_id = "1"
-        tenant_sign_here.page_number = "1"
-        tenant_sign_here.x_position = "100"
-        tenant_sign_here.y_position = "200"
-        tenant_sign_here.tab_label = "tenant_signature"
-        
-        tenant_tabs = Tabs()
-        tenant_tabs.sign_here_tabs = [tenant_sign_here]
-        tenant.tabs = tenant_tabs
-        
-        signers.append(tenant)
-        
-        return signers
+        return [
+            self._build_signer(
+                role,
+                recipient_id,
+                y_position,
+                email=f"{role}@example.com",
+                name=f"{role.title()} Name",
+                role_name=role.title()
+            )
+            for role, recipient_id, y_position, _, _ in _SIGNER_LAYOUT
+            if role != "witness"
+        ]
 
 
 # Global DocuSign service instance
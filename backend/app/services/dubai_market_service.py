@@ -5,11 +5,14 @@ Provides real market data, pricing optimization, and forecasting
 specifically tailored for Dubai's rental property market.
 """
 
-from datetime import datetime, timedelta, date
-from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, date
+from functools import lru_cache
+from typing import Dict, List, Any, NamedTuple, Optional, Sequence, Tuple
+import copy
 import json
 import math
 from enum import Enum
+from types import MappingProxyType
 
 class DubaiArea(Enum):
     """Dubai rental property areas with different pricing tiers"""
@@ -43,105 +46,228 @@ class DubaiEvent(Enum):
     UAE_NATIONAL_DAY = "uae_national_day"
     NEW_YEAR = "new_year"
 
+# Pricing multipliers based on Dubai area desirability and demand
+_AREA_MULTIPLIERS = MappingProxyType({
+    DubaiArea.PALM_JUMEIRAH.value: 2.0,     # Ultra premium
+    DubaiArea.MARINA.value: 1.6,            # Premium waterfront
+    DubaiArea.DOWNTOWN.value: 1.5,          # Business/tourist hub
+    DubaiArea.JBR.value: 1.4,              # Beach access
+    DubaiArea.BUSINESS_BAY.value: 1.2,      # Modern business district
+    DubaiArea.JUMEIRAH.value: 1.3,          # Traditional upscale
+    DubaiArea.JLT.value: 1.0,              # Base rate area
+    DubaiArea.SILICON_OASIS.value: 0.8,     # Tech hub, suburban
+    DubaiArea.DEIRA.value: 0.7,            # Traditional, lower cost
+    DubaiArea.BURDUBAI.value: 0.6           # Historic, budget area
+})
+
+# Seasonal demand multipliers for Dubai
+_SEASONAL_MULTIPLIERS = MappingProxyType({
+    DubaiSeason.PEAK_WINTER.value: 1.5,     # Dec-Feb: European winter escape
+    DubaiSeason.HIGH_WINTER.value: 1.3,     # Mar, Nov: Pleasant weather
+    DubaiSeason.SHOULDER.value: 1.0,        # Apr, Oct: Moderate demand
+    DubaiSeason.LOW_SUMMER.value: 0.7       # May-Sep: Hot summer discount
+})
+
+# Event-based surge pricing multipliers
+_EVENT_MULTIPLIERS = MappingProxyType({
+    DubaiEvent.F1_GRAND_PRIX.value: 3.0,
+    DubaiEvent.SHOPPING_FESTIVAL.value: 1.8,
+    DubaiEvent.GITEX.value: 1.6,
+    DubaiEvent.ARAB_HEALTH.value: 1.5,
+    DubaiEvent.UAE_NATIONAL_DAY.value: 1.4,
+    DubaiEvent.NEW_YEAR.value: 2.0,
+    DubaiEvent.EID_AL_FITR.value: 1.3,
+    DubaiEvent.EID_AL_ADHA.value: 1.3,
+    DubaiEvent.RAMADAN.value: 0.8  # Reduced tourism during Ramadan
+})
+
+# 2024 Dubai events calendar affecting rental demand
+_DUBAI_EVENTS_2024 = MappingProxyType({
+    "2024-01": [
+        {"name": "Dubai Shopping Festival", "type": DubaiEvent.SHOPPING_FESTIVAL.value, "days": list(range(1, 29))}
+    ],
+    "2024-03": [
+        {"name": "Formula 1 UAE Grand Prix", "type": DubaiEvent.F1_GRAND_PRIX.value, "days": [8, 9, 10]},
+        {"name": "Ramadan", "type": DubaiEvent.RAMADAN.value, "days": list(range(10, 32))}
+    ],
+    "2024-04": [
+        {"name": "Ramadan", "type": DubaiEvent.RAMADAN.value, "days": list(range(1, 10))},
+        {"name": "Eid Al-Fitr", "type": DubaiEvent.EID_AL_FITR.value, "days": [10, 11, 12]}
+    ],
+    "2024-06": [
+        {"name": "Eid Al-Adha", "type": DubaiEvent.EID_AL_ADHA.value, "days": [16, 17, 18]}
+    ],
+    "2024-10": [
+        {"name": "GITEX Technology Week", "type": DubaiEvent.GITEX.value, "days": list(range(14, 19))}
+    ],
+    "2024-12": [
+        {"name": "UAE National Day", "type": DubaiEvent.UAE_NATIONAL_DAY.value, "days": [2, 3]},
+        {"name": "New Year Celebrations", "type": DubaiEvent.NEW_YEAR.value, "days": [31]}
+    ]
+})
+
+# Static recommendation copy, shared across calls
+_HIGH_DEMAND_RECOMMENDATION = "High demand period - consider premium positioning"
+_SEASON_RECOMMENDATIONS = MappingProxyType({
+    DubaiSeason.PEAK_WINTER: "Peak winter season - maximize revenue with premium rates",
+    DubaiSeason.LOW_SUMMER: "Summer season - consider longer stay discounts"
+})
+_PREMIUM_AREA_RECOMMENDATIONS = (
+    "Premium positioning - focus on luxury amenities",
+    "Target high-end business and leisure travelers"
+)
+_STANDARD_AREA_RECOMMENDATIONS = (
+    "Competitive rates with quality amenities",
+    "Balanced approach for business and leisure"
+)
+_BUDGET_AREA_RECOMMENDATIONS = (
+    "Value positioning - emphasize cost-effectiveness",
+    "Target budget-conscious and longer-stay guests"
+)
+_AREA_SPECIFIC_RECOMMENDATIONS = MappingProxyType({
+    DubaiArea.MARINA.value: "Highlight waterfront views and dining options",
+    DubaiArea.DOWNTOWN.value: "Emphasize business facilities and metro access",
+    DubaiArea.JLT.value: "Target corporate clients and metro connectivity"
+})
+
+class DateFactors(NamedTuple):
+    """Date-dependent pricing multipliers; expanded to a dict only for API responses"""
+    season: str
+    seasonal_multiplier: float
+    event_multiplier: float
+    weekend_multiplier: float
+    active_events: List[Dict]
+    weekday: int
+    
+    def to_pricing_factors(
+        self, base_rate: float, area_multiplier: float, bedroom_multiplier: float
+    ) -> Dict[str, Any]:
+        """Build the `pricing_factors` breakdown returned by the pricing endpoints"""
+        pricing_factors = {
+            "base_rate": base_rate,
+            "area_multiplier": area_multiplier,
+            "seasonal_multiplier": self.seasonal_multiplier,
+            "season": self.season,
+            "event_multiplier": self.event_multiplier,
+            "active_events": self.active_events
+        }
+        if self.weekend_multiplier != 1.0:
+            pricing_factors["weekend_multiplier"] = self.weekend_multiplier
+        pricing_factors["bedroom_multiplier"] = bedroom_multiplier
+        return pricing_factors
+
+class _CalendarDays(NamedTuple):
+    """Date-dependent inputs shared by every property priced over the same range"""
+    dates: List[date]
+    factors: List[DateFactors]
+    seasonal_mults: List[float]
+    event_mults: List[float]
+    weekend_mults: List[float]
+
+# English names matching strftime("%b") / ("%A") in the C locale, without
+# going through the locale-aware formatter on every row
+_MONTH_ABBR = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Shared by every date without events; treat as read-only
+_NO_EVENTS: Tuple[float, List[Dict]] = (1.0, [])
+
+def _pricing_kernel(
+    constant_mult: float,
+    seasonal_mults: Sequence[float],
+    event_mults: Sequence[float],
+    weekend_mults: Sequence[float]
+) -> List[int]:
+    """Per-day prices, in whole cents, from the date-invariant constant and multiplier columns"""
+    cents_mult = constant_mult * 100
+    return [
+        round(cents_mult * seasonal * event * weekend)
+        for seasonal, event, weekend in zip(seasonal_mults, event_mults, weekend_mults)
+    ]
+
+@lru_cache(maxsize=8)
+def _forecast_variations(months_ahead: int) -> Tuple[float, ...]:
+    """Deterministic ±10% month-over-month variation applied to forecasts"""
+    return tuple(math.sin(i * 0.5) * 0.1 + 1 for i in range(months_ahead))
+
 class DubaiMarketService:
     """Service for Dubai-specific market intelligence and pricing optimization"""
     
-    def __init__(self):
-        self.area_multipliers = self._get_area_pricing_multipliers()
-        self.seasonal_multipliers = self._get_seasonal_multipliers()
-        self.event_multipliers = self._get_event_multipliers()
-        self.dubai_events_2024 = self._get_dubai_events_calendar_2024()
+    # Indexed by calendar month (1-12); slot 0 is unused
+    _SEASON_BY_MONTH: Tuple[Optional[DubaiSeason], ...] = (
+        None,
+        DubaiSeason.PEAK_WINTER,   # Jan
+        DubaiSeason.PEAK_WINTER,   # Feb
+        DubaiSeason.HIGH_WINTER,   # Mar
+        DubaiSeason.SHOULDER,      # Apr
+        DubaiSeason.LOW_SUMMER,    # May
+        DubaiSeason.LOW_SUMMER,    # Jun
+        DubaiSeason.LOW_SUMMER,    # Jul
+        DubaiSeason.LOW_SUMMER,    # Aug
+        DubaiSeason.LOW_SUMMER,    # Sep
+        DubaiSeason.SHOULDER,      # Oct
+        DubaiSeason.HIGH_WINTER,   # Nov
+        DubaiSeason.PEAK_WINTER,   # Dec
+    )
+    _SEASON_VALUE_BY_MONTH: Tuple[Optional[str], ...] = tuple(
+        season.value if season else None for season in _SEASON_BY_MONTH
+    )
+    _SEASONAL_MULT_BY_MONTH: Tuple[float, ...] = tuple(
+        _SEASONAL_MULTIPLIERS[season.value] if season else 1.0 for season in _SEASON_BY_MONTH
+    )
+    # Indexed by date.weekday(); Friday and Saturday are the Dubai weekend
+    _WEEKEND_BY_WEEKDAY: Tuple[float, ...] = (1.0, 1.0, 1.0, 1.0, 1.2, 1.2, 1.0)
+    _PROPERTY_TYPE_MULTIPLIERS: Dict[str, float] = {
+        "villa": 1.5,
+        "penthouse": 2.0,
+        "studio": 0.8
+    }
     
-    def _get_area_pricing_multipliers(self) -> Dict[str, float]:
-        """Pricing multipliers based on Dubai area desirability and demand"""
-        return {
-            DubaiArea.PALM_JUMEIRAH.value: 2.0,     # Ultra premium
-            DubaiArea.MARINA.value: 1.6,            # Premium waterfront
-            DubaiArea.DOWNTOWN.value: 1.5,          # Business/tourist hub
-            DubaiArea.JBR.value: 1.4,              # Beach access
-            DubaiArea.BUSINESS_BAY.value: 1.2,      # Modern business district
-            DubaiArea.JUMEIRAH.value: 1.3,          # Traditional upscale
-            DubaiArea.JLT.value: 1.0,              # Base rate area
-            DubaiArea.SILICON_OASIS.value: 0.8,     # Tech hub, suburban
-            DubaiArea.DEIRA.value: 0.7,            # Traditional, lower cost
-            DubaiArea.BURDUBAI.value: 0.6           # Historic, budget area
-        }
+    def __init__(self):
+        self.area_multipliers = _AREA_MULTIPLIERS
+        self.seasonal_multipliers = _SEASONAL_MULTIPLIERS
+        self.event_multipliers = _EVENT_MULTIPLIERS
+        self.dubai_events_2024 = _DUBAI_EVENTS_2024
+        self._events_by_ordinal = self._index_events_by_day(self.dubai_events_2024)
+        self._event_cache = self._build_event_cache(self._events_by_ordinal)
     
-    def _get_seasonal_multipliers(self) -> Dict[str, float]:
-        """Seasonal demand multipliers for Dubai"""
-        return {
-            DubaiSeason.PEAK_WINTER.value: 1.5,     # Dec-Feb: European winter escape
-            DubaiSeason.HIGH_WINTER.value: 1.3,     # Mar, Nov: Pleasant weather
-            DubaiSeason.SHOULDER.value: 1.0,        # Apr, Oct: Moderate demand
-            DubaiSeason.LOW_SUMMER.value: 0.7       # May-Sep: Hot summer discount
-        }
+    @staticmethod
+    def _index_events_by_day(calendar: Dict[str, List[Dict]]) -> Dict[int, List[Dict]]:
+        """Flatten the month-keyed calendar into a date-ordinal -> events map"""
+        events_by_ordinal: Dict[int, List[Dict]] = {}
+        for month_key, events in calendar.items():
+            year, month = (int(part) for part in month_key.split("-"))
+            for event in events:
+                for day in event["days"]:
+                    ordinal = date(year, month, day).toordinal()
+                    events_by_ordinal.setdefault(ordinal, []).append(event)
+        return events_by_ordinal
     
-    def _get_event_multipliers(self) -> Dict[str, float]:
-        """Event-based surge pricing multipliers"""
-        return {
-            DubaiEvent.F1_GRAND_PRIX.value: 3.0,
-            DubaiEvent.SHOPPING_FESTIVAL.value: 1.8,
-            DubaiEvent.GITEX.value: 1.6,
-            DubaiEvent.ARAB_HEALTH.value: 1.5,
-            DubaiEvent.UAE_NATIONAL_DAY.value: 1.4,
-            DubaiEvent.NEW_YEAR.value: 2.0,
-            DubaiEvent.EID_AL_FITR.value: 1.3,
-            DubaiEvent.EID_AL_ADHA.value: 1.3,
-            DubaiEvent.RAMADAN.value: 0.8  # Reduced tourism during Ramadan
-        }
-    
-    def _get_dubai_events_calendar_2024(self) -> Dict[str, List[Dict]]:
-        """2024 Dubai events calendar affecting rental demand"""
-        return {
-            "2024-01": [
-                {"name": "Dubai Shopping Festival", "type": DubaiEvent.SHOPPING_FESTIVAL.value, "days": list(range(1, 29))}
-            ],
-            "2024-03": [
-                {"name": "Formula 1 UAE Grand Prix", "type": DubaiEvent.F1_GRAND_PRIX.value, "days": [8, 9, 10]}
-            ],
-            "2024-03": [
-                {"name": "Ramadan", "type": DubaiEvent.RAMADAN.value, "days": list(range(10, 32))}
-            ],
-            "2024-04": [
-                {"name": "Ramadan", "type": DubaiEvent.RAMADAN.value, "days": list(range(1, 10))},
-                {"name": "Eid Al-Fitr", "type": DubaiEvent.EID_AL_FITR.value, "days": [10, 11, 12]}
-            ],
-            "2024-06": [
-                {"name": "Eid Al-Adha", "type": DubaiEvent.EID_AL_ADHA.value, "days": [16, 17, 18]}
-            ],
-            "2024-10": [
-                {"name": "GITEX Technology Week", "type": DubaiEvent.GITEX.value, "days": list(range(14, 19))}
-            ],
-            "2024-12": [
-                {"name": "UAE National Day", "type": DubaiEvent.UAE_NATIONAL_DAY.value, "days": [2, 3]},
-                {"name": "New Year Celebrations", "type": DubaiEvent.NEW_YEAR.value, "days": [31]}
+    def _build_event_cache(
+        self, events_by_ordinal: Dict[int, List[Dict]]
+    ) -> Dict[int, Tuple[float, List[Dict]]]:
+        """Precompute the peak event multiplier and active-event summaries per day"""
+        event_cache = {}
+        for ordinal, events in events_by_ordinal.items():
+            active_events = [
+                {
+                    "name": event["name"],
+                    "type": event["type"],
+                    "multiplier": self.event_multipliers.get(event["type"], 1.0)
+                }
+                for event in events
             ]
-        }
+            max_event_multiplier = max((e["multiplier"] for e in active_events), default=1.0)
+            event_cache[ordinal] = (max(1.0, max_event_multiplier), active_events)
+        return event_cache
     
     def get_season_for_date(self, target_date: date) -> DubaiSeason:
         """Determine Dubai season for a given date"""
-        month = target_date.month
-        
-        if month in [12, 1, 2]:
-            return DubaiSeason.PEAK_WINTER
-        elif month in [3, 11]:
-            return DubaiSeason.HIGH_WINTER
-        elif month in [4, 10]:
-            return DubaiSeason.SHOULDER
-        else:  # May-September
-            return DubaiSeason.LOW_SUMMER
+        return self._SEASON_BY_MONTH[target_date.month]
     
     def get_events_for_date(self, target_date: date) -> List[Dict]:
         """Get Dubai events affecting the given date"""
-        month_key = target_date.strftime("%Y-%m")
-        events = []
-        
-        if month_key in self.dubai_events_2024:
-            for event in self.dubai_events_2024[month_key]:
-                if target_date.day in event["days"]:
-                    events.append(event)
-        
-        return events
+        return self._events_by_ordinal.get(target_date.toordinal(), [])
     
     def calculate_optimal_price(
         self, 
@@ -152,71 +278,85 @@ class DubaiMarketService:
         bedrooms: int = 1
     ) -> Dict[str, Any]:
         """Calculate optimal pricing for a property on a specific date"""
-        
-        # Start with base rate
-        price = base_rate
-        pricing_factors = {"base_rate": base_rate}
-        
-        # Apply area multiplier
         area_multiplier = self.area_multipliers.get(area, 1.0)
-        price *= area_multiplier
-        pricing_factors["area_multiplier"] = area_multiplier
+        bedroom_multiplier = self._get_bedroom_multiplier(bedrooms)
+        constant_mult = base_rate * self._compute_static_mult(area, property_type, bedrooms)
         
-        # Apply seasonal multiplier
         season = self.get_season_for_date(target_date)
-        seasonal_multiplier = self.seasonal_multipliers[season.value]
-        price *= seasonal_multiplier
-        pricing_factors["seasonal_multiplier"] = seasonal_multiplier
-        pricing_factors["season"] = season.value
-        
-        # Apply event multipliers
-        events = self.get_events_for_date(target_date)
-        max_event_multiplier = 1.0
-        active_events = []
-        
-        for event in events:
-            event_multiplier = self.event_multipliers.get(event["type"], 1.0)
-            if event_multiplier > max_event_multiplier:
-                max_event_multiplier = event_multiplier
-            active_events.append({
-                "name": event["name"],
-                "type": event["type"],
-                "multiplier": event_multiplier
-            })
+        factors = self._compute_date_multipliers(target_date)
+        price = self._price_for_factors(constant_mult, factors)
         
-        price *= max_event_multiplier
-        pricing_factors["event_multiplier"] = max_event_multiplier
-        pricing_factors["active_events"] = active_events
-        
-        # Weekend premium (Fri-Sat in Dubai)
-        if target_date.weekday() in [4, 5]:  # Friday, Saturday
-            weekend_multiplier = 1.2
-            price *= weekend_multiplier
-            pricing_factors["weekend_multiplier"] = weekend_multiplier
-        
-        # Property type adjustments
-        if property_type == "villa":
-            price *= 1.5
-        elif property_type == "penthouse":
-            price *= 2.0
-        elif property_type == "studio":
-            price *= 0.8
-        
-        # Bedroom count multiplier
-        bedroom_multiplier = max(0.5, min(3.0, 0.7 + (bedrooms * 0.3)))
-        price *= bedroom_multiplier
-        pricing_factors["bedroom_multiplier"] = bedroom_multiplier
+        # The ">50% above base" recommendation compares the unrounded price, multiplied in
+        # the same order as before, so results right at 1.5x don't flip with rounding
+        unrounded_price = (
+            base_rate * area_multiplier
+            * factors.seasonal_multiplier * factors.event_multiplier * factors.weekend_multiplier
+            * self._PROPERTY_TYPE_MULTIPLIERS.get(property_type, 1.0)
+            * bedroom_multiplier
+        )
         
         return {
-            "suggested_price": round(price, 2),
-            "pricing_factors": pricing_factors,
-            "demand_level": self._get_demand_level(seasonal_multiplier, max_event_multiplier),
+            "suggested_price": price,
+            "pricing_factors": factors.to_pricing_factors(base_rate, area_multiplier, bedroom_multiplier),
+            "demand_level": self._get_demand_level(factors.seasonal_multiplier, factors.event_multiplier),
             "recommendations": self._get_pricing_recommendations(
-                base_rate, price, active_events, season
+                base_rate, unrounded_price, factors.active_events, season
             )
         }
     
-    def _get_demand_level(self, seasonal_mult: float, event_mult: float) -> str:
+    def _calculate_price_fast(
+        self,
+        base_rate: float,
+        area: str,
+        target_date: date,
+        property_type: str = "apartment",
+        bedrooms: int = 1
+    ) -> float:
+        """Suggested price only, without the pricing_factors/recommendations envelope"""
+        constant_mult = base_rate * self._compute_static_mult(area, property_type, bedrooms)
+        return self._price_for_factors(constant_mult, self._compute_date_multipliers(target_date))
+    
+    @staticmethod
+    def _price_for_factors(constant_mult: float, factors: DateFactors) -> float:
+        """Single-day price through the same kernel the calendar uses"""
+        price_cents = _pricing_kernel(
+            constant_mult,
+            (factors.seasonal_multiplier,),
+            (factors.event_multiplier,),
+            (factors.weekend_multiplier,)
+        )[0]
+        return price_cents / 100
+    
+    @staticmethod
+    def _get_bedroom_multiplier(bedrooms: int) -> float:
+        """Bedroom count multiplier, clamped to 0.5x-3.0x"""
+        return max(0.5, min(3.0, 0.7 + (bedrooms * 0.3)))
+    
+    def _compute_static_mult(self, area: str, property_type: str, bedrooms: int) -> float:
+        """Combined area, property type and bedroom multiplier (independent of date)"""
+        return (
+            self.area_multipliers.get(area, 1.0)
+            * self._PROPERTY_TYPE_MULTIPLIERS.get(property_type, 1.0)
+            * self._get_bedroom_multiplier(bedrooms)
+        )
+    
+    def _compute_date_multipliers(self, target_date: date) -> DateFactors:
+        """Seasonal, event and weekend multipliers plus the active events for a date"""
+        month = target_date.month
+        season_value = self._SEASON_VALUE_BY_MONTH[month]
+        seasonal_multiplier = self._SEASONAL_MULT_BY_MONTH[month]
+        
+        max_event_multiplier, active_events = self._event_cache.get(target_date.toordinal(), _NO_EVENTS)
+        
+        weekday = target_date.weekday()
+        weekend_multiplier = self._WEEKEND_BY_WEEKDAY[weekday]
+        return DateFactors(
+            season_value, seasonal_multiplier, max_event_multiplier, weekend_multiplier, active_events, weekday
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _get_demand_level(seasonal_mult: float, event_mult: float) -> str:
         """Determine demand level based on multipliers"""
         total_mult = seasonal_mult * event_mult
         
@@ -241,16 +381,14 @@ class DubaiMarketService:
         increase_pct = ((suggested_price - base_rate) / base_rate) * 100
         
         if increase_pct > 50:
-            recommendations.append("High demand period - consider premium positioning")
+            recommendations.append(_HIGH_DEMAND_RECOMMENDATION)
         
         if events:
-            event_names = [e["name"] for e in events]
-            recommendations.append(f"Major events active: {', '.join(event_names)}")
+            recommendations.append("Major events active: " + ", ".join(e["name"] for e in events))
         
-        if season == DubaiSeason.PEAK_WINTER:
-            recommendations.append("Peak winter season - maximize revenue with premium rates")
-        elif season == DubaiSeason.LOW_SUMMER:
-            recommendations.append("Summer season - consider longer stay discounts")
+        season_recommendation = _SEASON_RECOMMENDATIONS.get(season)
+        if season_recommendation:
+            recommendations.append(season_recommendation)
         
         return recommendations
     
@@ -260,68 +398,135 @@ class DubaiMarketService:
         area: str, 
         days_ahead: int = 30,
         property_type: str = "apartment",
-        bedrooms: int = 1
+        bedrooms: int = 1,
+        today: Optional[date] = None
     ) -> List[Dict]:
-        """Generate pricing calendar for next N days"""
-        calendar = []
-        start_date = date.today()
+        """Generate pricing calendar for next N days (starting `today`, default the current date)"""
+        days = self._get_calendar_days(days_ahead, today)
+        return self._build_pricing_calendar(days, base_rate, area, property_type, bedrooms)
+    
+    def generate_pricing_calendars_bulk(
+        self,
+        properties: List[Dict[str, Any]],
+        days_ahead: int = 30,
+        today: Optional[date] = None
+    ) -> List[List[Dict]]:
+        """Generate pricing calendars for several properties at once
         
-        for i in range(days_ahead):
-            target_date = start_date + timedelta(days=i)
-            pricing_data = self.calculate_optimal_price(
-                base_rate, area, target_date, property_type, bedrooms
+        Each property dict needs `base_rate` and `area`, and may set
+        `property_type` and `bedrooms`. The date-dependent factors are
+        computed once and shared; calendars are returned in input order.
+        """
+        days = self._get_calendar_days(days_ahead, today)
+        return [
+            self._build_pricing_calendar(
+                days,
+                prop["base_rate"],
+                prop["area"],
+                prop.get("property_type", "apartment"),
+                prop.get("bedrooms", 1)
             )
-            
+            for prop in properties
+        ]
+    
+    def _get_calendar_days(self, days_ahead: int, today: Optional[date] = None) -> _CalendarDays:
+        """Dates and date-dependent pricing factors for the next N days"""
+        start_ordinal = (today or date.today()).toordinal()
+        dates = [date.fromordinal(start_ordinal + i) for i in range(days_ahead)]
+        day_factors = [self._compute_date_multipliers(d) for d in dates]
+        return _CalendarDays(
+            dates,
+            day_factors,
+            [f.seasonal_multiplier for f in day_factors],
+            [f.event_multiplier for f in day_factors],
+            [f.weekend_multiplier for f in day_factors]
+        )
+    
+    def _build_pricing_calendar(
+        self,
+        days: _CalendarDays,
+        base_rate: float,
+        area: str,
+        property_type: str,
+        bedrooms: int
+    ) -> List[Dict]:
+        """Price one property across precomputed calendar days"""
+        # Area, property type and bedrooms don't vary by date, so fold them
+        # into one constant and only apply the per-date factors in the loop
+        area_multiplier = self.area_multipliers.get(area, 1.0)
+        bedroom_multiplier = self._get_bedroom_multiplier(bedrooms)
+        constant_mult = base_rate * self._compute_static_mult(area, property_type, bedrooms)
+        
+        prices_cents = _pricing_kernel(
+            constant_mult, days.seasonal_mults, days.event_mults, days.weekend_mults
+        )
+        
+        calendar = []
+        for d, price_cents, factors in zip(days.dates, prices_cents, days.factors):
             calendar.append({
-                "date": target_date.isoformat(),
-                "day_name": target_date.strftime("%A"),
-                "suggested_price": pricing_data["suggested_price"],
-                "demand_level": pricing_data["demand_level"],
-                "active_events": [e["name"] for e in pricing_data["pricing_factors"]["active_events"]],
-                "season": pricing_data["pricing_factors"]["season"],
-                "pricing_factors": pricing_data["pricing_factors"]
+                "date": d.isoformat(),
+                "day_name": _DAY_NAMES[factors.weekday],
+                "suggested_price": price_cents / 100,
+                "demand_level": self._get_demand_level(factors.seasonal_multiplier, factors.event_multiplier),
+                "active_events": [e["name"] for e in factors.active_events],
+                "season": factors.season,
+                "pricing_factors": factors.to_pricing_factors(base_rate, area_multiplier, bedroom_multiplier)
             })
         
         return calendar
     
-    def get_market_forecast(self, months_ahead: int = 12) -> Dict[str, Any]:
-        """Generate market forecast for Dubai rental market"""
-        forecast_data = []
+    def get_market_forecast(self, months_ahead: int = 12, today: Optional[date] = None) -> Dict[str, Any]:
+        """Generate market forecast for Dubai rental market (starting `today`, default the current date)"""
         base_revenue = 5000  # Base monthly revenue
+        start_ordinal = (today or date.today()).toordinal()
+        future_dates = [date.fromordinal(start_ordinal + 30 * i) for i in range(months_ahead)]
+        variations = _forecast_variations(months_ahead)
         
-        for i in range(months_ahead):
-            future_date = date.today() + timedelta(days=30 * i)
-            season = self.get_season_for_date(future_date)
-            seasonal_mult = self.seasonal_multipliers[season.value]
-            
-            # Add some realistic variation
-            variation = math.sin(i * 0.5) * 0.1 + 1  # ±10% variation
-            forecasted_revenue = base_revenue * seasonal_mult * variation
-            
-            # Calculate confidence based on how far in future
-            confidence = max(60, 95 - (i * 3))  # Decreasing confidence over time
-            
-            forecast_data.append({
-                "month": future_date.strftime("%b %Y"),
-                "month_short": future_date.strftime("%b"),
-                "forecasted_revenue": round(forecasted_revenue, 2),
+        seasons = [self._SEASON_VALUE_BY_MONTH[d.month] for d in future_dates]
+        seasonal_mults = [self._SEASONAL_MULT_BY_MONTH[d.month] for d in future_dates]
+        revenues = [
+            round(base_revenue * seasonal_mult * variation, 2)
+            for seasonal_mult, variation in zip(seasonal_mults, variations)
+        ]
+        # Calculate confidence based on how far in future
+        confidences = [max(60, 95 - (i * 3)) for i in range(months_ahead)]  # Decreasing confidence over time
+        
+        forecast_data = [
+            {
+                "month": f"{_MONTH_ABBR[d.month]} {d.year}",
+                "month_short": _MONTH_ABBR[d.month],
+                "forecasted_revenue": revenue,
                 "confidence": confidence,
-                "season": season.value,
+                "season": season,
                 "seasonal_multiplier": seasonal_mult
-            })
+            }
+            for d, revenue, confidence, season, seasonal_mult in zip(
+                future_dates, revenues, confidences, seasons, seasonal_mults
+            )
+        ]
+        
+        peak_index = max(range(months_ahead), key=revenues.__getitem__)
+        low_index = min(range(months_ahead), key=revenues.__getitem__)
         
         return {
             "forecast_data": forecast_data,
             "insights": {
-                "peak_month": max(forecast_data, key=lambda x: x["forecasted_revenue"]),
-                "low_month": min(forecast_data, key=lambda x: x["forecasted_revenue"]),
-                "average_confidence": round(sum(f["confidence"] for f in forecast_data) / len(forecast_data), 1)
+                "peak_month": forecast_data[peak_index],
+                "low_month": forecast_data[low_index],
+                "average_confidence": round(sum(confidences) / months_ahead, 1)
             }
         }
     
     def get_market_benchmarks(self, area: str, property_type: str = "apartment") -> Dict[str, Any]:
         """Get market benchmarks for a specific Dubai area"""
-        area_mult = self.area_multipliers.get(area, 1.0)
+        # Benchmarks depend only on the area; callers get their own copy to mutate
+        return copy.deepcopy(self._compute_market_benchmarks(area))
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _compute_market_benchmarks(area: str) -> Dict[str, Any]:
+        """Build (and memoize) the benchmark payload for an area"""
+        area_mult = _AREA_MULTIPLIERS.get(area, 1.0)
         base_adr = 120  # Base Average Daily Rate
         
         market_adr = base_adr * area_mult
@@ -337,15 +542,16 @@ class DubaiMarketService:
             "area_insights": {
                 "area": area.replace("_", " ").title(),
                 "tier": "Premium" if area_mult >= 1.4 else "Standard" if area_mult >= 1.0 else "Budget",
-                "primary_demand": self._get_area_demand_profile(area),
+                "primary_demand": DubaiMarketService._get_area_demand_profile(area),
                 "seasonality_impact": "High" if area_mult >= 1.3 else "Medium"
             },
-            "recommendations": self._get_area_recommendations(area, area_mult)
+            "recommendations": DubaiMarketService._get_area_recommendations(area, area_mult)
         }
         
         return benchmarks
     
-    def _get_area_demand_profile(self, area: str) -> str:
+    @staticmethod
+    def _get_area_demand_profile(area: str) -> str:
         """Get primary demand profile for Dubai area"""
         profiles = {
             DubaiArea.MARINA.value: "Tourists & Business Travelers",
@@ -361,27 +567,20 @@ class DubaiMarketService:
         }
         return profiles.get(area, "Mixed Demand")
     
-    def _get_area_recommendations(self, area: str, multiplier: float) -> List[str]:
+    @staticmethod
+    def _get_area_recommendations(area: str, multiplier: float) -> List[str]:
         """Get area-specific recommendations"""
-        recommendations = []
-        
         if multiplier >= 1.5:
-            recommendations.append("Premium positioning - focus on luxury amenities")
-            recommendations.append("Target high-end business and leisure travelers")
+            recommendations = list(_PREMIUM_AREA_RECOMMENDATIONS)
         elif multiplier >= 1.0:
-            recommendations.append("Competitive rates with quality amenities")
-            recommendations.append("Balanced approach for business and leisure")
+            recommendations = list(_STANDARD_AREA_RECOMMENDATIONS)
         else:
-            recommendations.append("Value positioning - emphasize cost-effectiveness")
-            recommendations.append("Target budget-conscious and longer-stay guests")
+            recommendations = list(_BUDGET_AREA_RECOMMENDATIONS)
         
         # Area-specific recommendations
-        if area == DubaiArea.MARINA.value:
-            recommendations.append("Highlight waterfront views and dining options")
-        elif area == DubaiArea.DOWNTOWN.value:
-            recommendations.append("Emphasize business facilities and metro access")
-        elif area == DubaiArea.JLT.value:
-            recommendations.append("Target corporate clients and metro connectivity")
+        area_recommendation = _AREA_SPECIFIC_RECOMMENDATIONS.get(area)
+        if area_recommendation:
+            recommendations.append(area_recommendation)
         
         return recommendations
 
@@ -2,11 +2,18 @@
 Google Calendar Integration Service for Property Viewing Scheduling
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
+import asyncio
+import functools
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
 import uuid
+from zoneinfo import ZoneInfo
+
+from cachetools import TTLCache
 
 from app.core.config import settings
 from app.core.supabase_client import supabase_client
@@ -18,6 +25,9 @@ try:
     from google_auth_oauthlib.flow import Flow
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    from googleapiclient.http import HttpRequest
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
     GOOGLE_CALENDAR_AVAILABLE = True
 except ImportError:
     # Create mock classes if Google Calendar is not available
@@ -32,10 +42,104 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Supabase and googleapiclient are synchronous; run them here instead of on the event loop
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="google-calendar")
+
+# Socket timeout for Calendar API requests
+GOOGLE_HTTP_TIMEOUT = 10  # seconds
+
+# Refresh access tokens in the background once they're this close to expiry
+CREDENTIALS_REFRESH_MARGIN = 300  # seconds
+
+# Parsed credentials are re-read from the database after this long, so tokens replaced
+# by another worker (or directly in the database) are picked up
+CREDENTIALS_CACHE_TTL = 600  # seconds
+CREDENTIALS_CACHE_MAX = 1024
+
+# Maximum number of calls Google accepts in one batch request
+CALENDAR_BATCH_SIZE = 50
+
+# Upper bound on per-agent refresh locks kept around between refreshes
+REFRESH_LOCKS_MAX = 1024
+
+# How long an agent's calendar-connected status is trusted before re-reading it
+# (other workers may have connected or disconnected the agent in the meantime)
+CONNECTED_AGENTS_TTL = 60  # seconds
+CONNECTED_AGENTS_MAX = 10_000
+
+# Property titles and addresses on calendar events may lag edits by this much
+PROPERTY_CACHE_TTL = 300  # seconds
+
+# Length of a bookable viewing slot
+SLOT_SECONDS = 30 * 60
+
+# Viewings, working hours and free/busy queries are all in Dubai local time
+DUBAI_TZ_NAME = "Asia/Dubai"
+DUBAI_TZ = ZoneInfo(DUBAI_TZ_NAME)
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO timestamp for the database"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _dubai_datetime(viewing_date: str, viewing_time: str) -> datetime:
+    """Aware Dubai datetime for a viewing's scheduled date and time"""
+    return datetime.combine(date.fromisoformat(viewing_date), time.fromisoformat(viewing_time), tzinfo=DUBAI_TZ)
+
+
+def _parse_busy_time(value: str) -> float:
+    """Epoch seconds for a free/busy timestamp (naive values are Dubai local time)"""
+    parsed = datetime.fromisoformat(value)  # Handles the trailing Z on Python 3.11+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=DUBAI_TZ)
+    return parsed.timestamp()
+
+
+class _ThreadLocalHttp:
+    """
+    httplib2.Http shared by every agent's requests, one per worker thread.
+    
+    httplib2.Http isn't thread-safe, but each executor thread reusing its own
+    keeps TLS connections to Google warm across calls.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    @property
+    def http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=GOOGLE_HTTP_TIMEOUT)
+        return http
+    
+    def request(self, *args, **kwargs):
+        return self.http.request(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+_pooled_http = _ThreadLocalHttp()
+
+
 class GoogleCalendarService:
     def __init__(self):
         self.google_calendar_available = GOOGLE_CALENDAR_AVAILABLE
         
+        # Parsed credentials per agent, so calendar calls skip the agents lookup
+        self._credentials_cache: TTLCache = TTLCache(maxsize=CREDENTIALS_CACHE_MAX, ttl=CREDENTIALS_CACHE_TTL)
+        self._refreshing_agents: Set[str] = set()
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
+        # Whether each agent has stored Google credentials, re-read after CONNECTED_AGENTS_TTL
+        self._connected_agents: TTLCache = TTLCache(maxsize=CONNECTED_AGENTS_MAX, ttl=CONNECTED_AGENTS_TTL)
+        # Built Calendar API clients per agent, with the credentials they were built for
+        self._service_cache: Dict[str, Tuple[Any, Credentials]] = {}
+        self._pending_updates: Set[asyncio.Task] = set()
+        # Property title/address for event text, keyed by property id
+        self._property_cache: TTLCache = TTLCache(maxsize=10_000, ttl=PROPERTY_CACHE_TTL)
+        
         if not self.google_calendar_available:
             logger.warning("Google Calendar library not available. Calendar features will be disabled.")
             return
@@ -47,6 +151,16 @@ class GoogleCalendarService:
             'https://www.googleapis.com/auth/calendar',
             'https://www.googleapis.com/auth/calendar.events'
         ]
+        # OAuth client config shared by every authorization flow
+        self._client_config = {
+            "web": {
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "redirect_uris": [self.redirect_uri]
+            }
+        }
         
         if self.client_id and self.client_secret:
             logger.info("Google Calendar service initialized successfully")
@@ -65,18 +179,7 @@ class GoogleCalendarService:
             if not self.client_id or not self.client_secret:
                 raise Exception("Google Calendar credentials not configured")
             
-            flow = Flow.from_client_config(
-                {
-                    "web": {
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        "redirect_uris": [self.redirect_uri]
-                    }
-                },
-                scopes=self.scopes
-            )
+            flow = Flow.from_client_config(self._client_config, scopes=self.scopes)
             flow.redirect_uri = self.redirect_uri
             
             authorization_url, state = flow.authorization_url(
@@ -88,7 +191,7 @@ class GoogleCalendarService:
             return authorization_url
             
         except Exception as e:
-            logger.error(f"Failed to get authorization URL: {e}")
+            logger.error("Failed to get authorization URL: %s", e)
             raise
     
     async def handle_oauth_callback(self, code: str, state: str) -> Dict[str, Any]:
@@ -98,18 +201,7 @@ class GoogleCalendarService:
         try:
             agent_id = state  # agent_id was passed as state parameter
             
-            flow = Flow.from_client_config(
-                {
-                    "web": {
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        "redirect_uris": [self.redirect_uri]
-                    }
-                },
-                scopes=self.scopes
-            )
+            flow = Flow.from_client_config(self._client_config, scopes=self.scopes)
             flow.redirect_uri = self.redirect_uri
             
             # Exchange authorization code for tokens
@@ -126,15 +218,15 @@ class GoogleCalendarService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to handle OAuth callback: {e}")
+            logger.error("Failed to handle OAuth callback: %s", e)
             raise
     
     async def _store_agent_credentials(self, agent_id: str, credentials: Credentials):
         """Store encrypted Google credentials for agent"""
         try:
+            # Long-lived OAuth client details; the access token lives in its own columns
             # In production, encrypt credentials before storing
             credentials_data = {
-                "token": credentials.token,
                 "refresh_token": credentials.refresh_token,
                 "token_uri": credentials.token_uri,
                 "client_id": credentials.client_id,
@@ -143,42 +235,181 @@ class GoogleCalendarService:
             }
             
             # Update agent with Google Calendar credentials
-            supabase_client.table("agents").update({
+            await self._run_blocking(supabase_client.table("agents").update({
                 "google_calendar_id": "primary",
-                "google_credentials": json.dumps(credentials_data),  # In production: encrypt this
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", agent_id).execute()
+                "google_credentials": json.dumps(credentials_data, separators=(",", ":")),  # In production: encrypt this
+                **self._access_token_columns(credentials),
+                "updated_at": _now_iso()
+            }).eq("id", agent_id).execute)
+            
+            self._credentials_cache[agent_id] = credentials
+            self._connected_agents[agent_id] = True
             
         except Exception as e:
-            logger.error(f"Failed to store agent credentials: {e}")
+            logger.error("Failed to store agent credentials: %s", e)
             raise
     
+    async def _store_access_token(self, agent_id: str, credentials: Credentials):
+        """Persist just the refreshed access token and its expiry"""
+        # Skip agents who disconnected while the refresh was in flight
+        await self._run_blocking(supabase_client.table("agents").update(
+            self._access_token_columns(credentials)
+        ).eq("id", agent_id).not_.is_("google_credentials", "null").execute)
+    
+    @staticmethod
+    def _access_token_columns(credentials: Credentials) -> Dict[str, Any]:
+        """Access token columns for the agents table (Credentials.expiry is naive UTC)"""
+        expiry = credentials.expiry
+        return {
+            "google_access_token": credentials.token,
+            "google_access_token_expires_at": expiry.replace(tzinfo=timezone.utc).isoformat() if expiry else None
+        }
+    
     async def _get_agent_credentials(self, agent_id: str) -> Optional[Credentials]:
-        """Get and refresh agent's Google credentials"""
+        """Get agent's Google credentials, refreshing the access token ahead of expiry"""
         try:
-            # Get agent's stored credentials
-            agent_result = supabase_client.table("agents").select("google_credentials").eq("id", agent_id).execute()
-            
-            if not agent_result.data or not agent_result.data[0].get("google_credentials"):
+            # Checked on cache hits too: the agent may have disconnected in another worker
+            if not await self.is_calendar_connected(agent_id):
+                self._credentials_cache.pop(agent_id, None)
+                self._service_cache.pop(agent_id, None)
                 return None
             
-            credentials_data = json.loads(agent_result.data[0]["google_credentials"])
-            
-            # Recreate credentials object
-            credentials = Credentials.from_authorized_user_info(credentials_data, self.scopes)
-            
-            # Refresh token if needed
-            if credentials.expired and credentials.refresh_token:
-                credentials.refresh(Request())
-                # Update stored credentials
-                await self._store_agent_credentials(agent_id, credentials)
+            credentials = self._credentials_cache.get(agent_id)
+            if credentials is None:
+                credentials = await self._load_agent_credentials(agent_id)
+                if credentials is None:
+                    return None
+                self._credentials_cache[agent_id] = credentials
+            
+            time_to_expiry = self._seconds_to_expiry(credentials)
+            if time_to_expiry <= 0:
+                # Expired (or expiry unknown): the caller has to wait for a new token
+                if credentials.refresh_token:
+                    await self._refresh_agent_credentials(agent_id, credentials)
+            elif time_to_expiry <= CREDENTIALS_REFRESH_MARGIN and agent_id not in self._refreshing_agents:
+                # Stale: keep using the current token and refresh in the background
+                self._refreshing_agents.add(agent_id)
+                refresh_task = asyncio.create_task(self._refresh_agent_credentials(agent_id, credentials))
+                refresh_task.add_done_callback(self._log_refresh_failure)
             
             return credentials
             
         except Exception as e:
-            logger.error(f"Failed to get agent credentials: {e}")
+            logger.error("Failed to get agent credentials: %s", e)
             return None
     
+    async def _load_agent_credentials(self, agent_id: str) -> Optional[Credentials]:
+        """Load agent's stored Google credentials from the database"""
+        agent_result = await self._run_blocking(supabase_client.table("agents").select(
+            "google_credentials, google_access_token, google_access_token_expires_at"
+        ).eq("id", agent_id).execute)
+        
+        if not agent_result.data or not agent_result.data[0].get("google_credentials"):
+            return None
+        
+        agent = agent_result.data[0]
+        credentials_data = json.loads(agent["google_credentials"])
+        
+        # Recreate credentials object
+        credentials = Credentials.from_authorized_user_info(credentials_data, self.scopes)
+        
+        # Blobs written before the access token had its own columns still carry the token
+        if agent.get("google_access_token"):
+            credentials.token = agent["google_access_token"]
+            expires_at = agent.get("google_access_token_expires_at")
+            credentials.expiry = (
+                datetime.fromisoformat(expires_at).astimezone(timezone.utc).replace(tzinfo=None)
+                if expires_at else None
+            )
+        
+        return credentials
+    
+    def invalidate_agent_credentials(self, agent_id: str):
+        """Drop cached credentials, e.g. after the agent disconnects their calendar"""
+        self._credentials_cache.pop(agent_id, None)
+        self._service_cache.pop(agent_id, None)
+        self._connected_agents[agent_id] = False
+    
+    async def is_calendar_connected(self, agent_id: str) -> bool:
+        """Whether the agent has stored Google credentials (cached per agent for CONNECTED_AGENTS_TTL)"""
+        connected = self._connected_agents.get(agent_id)
+        if connected is None:
+            result = await self._run_blocking(
+                supabase_client.table("agents").select("id").eq("id", agent_id)
+                .not_.is_("google_credentials", "null").limit(1).execute
+            )
+            connected = self._connected_agents[agent_id] = bool(result.data)
+        return connected
+    
+    async def _get_service(self, agent_id: str):
+        """Calendar API client for the agent, rebuilt only when their credentials change"""
+        credentials = await self._get_agent_credentials(agent_id)
+        if not credentials:
+            return None
+        
+        cached = self._service_cache.get(agent_id)
+        if cached and cached[1] is credentials:
+            return cached[0]
+        
+        # Requests are built on the event loop but executed on the thread pool, so the
+        # authorized transport resolves the calling thread's pooled Http at send time
+        authorized_http = AuthorizedHttp(credentials, http=_pooled_http)
+        
+        def build_request(http, *args, **kwargs):
+            return HttpRequest(authorized_http, *args, **kwargs)
+        
+        service = build(
+            'calendar', 'v3',
+            credentials=credentials,
+            requestBuilder=build_request,
+            cache_discovery=False
+        )
+        self._service_cache[agent_id] = (service, credentials)
+        return service
+    
+    @staticmethod
+    async def _run_blocking(fn, *args):
+        """Run a blocking Supabase or Google API call on the calendar thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(_executor, functools.partial(fn, *args))
+    
+    @staticmethod
+    def _seconds_to_expiry(credentials: Credentials) -> float:
+        """Seconds until the access token expires (0 if unknown or already expired)"""
+        if not credentials.expiry:
+            return 0
+        # google-auth keeps Credentials.expiry as naive UTC, so compare against naive UTC now
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (credentials.expiry - now).total_seconds()
+    
+    async def _refresh_agent_credentials(self, agent_id: str, credentials: Credentials):
+        """Refresh agent's access token off the event loop and persist it"""
+        try:
+            # Concurrent callers for the same agent wait for a single refresh
+            async with self._refresh_lock(agent_id):
+                if self._seconds_to_expiry(credentials) > CREDENTIALS_REFRESH_MARGIN:
+                    return  # Someone else refreshed these credentials while we waited
+                await self._run_blocking(credentials.refresh, Request())
+                await self._store_access_token(agent_id, credentials)
+        finally:
+            self._refreshing_agents.discard(agent_id)
+    
+    def _refresh_lock(self, agent_id: str) -> asyncio.Lock:
+        """Per-agent refresh lock, dropping idle locks once the map gets large"""
+        lock = self._refresh_locks.get(agent_id)
+        if lock is None:
+            if len(self._refresh_locks) >= REFRESH_LOCKS_MAX:
+                self._refresh_locks = {
+                    key: held for key, held in self._refresh_locks.items() if held.locked()
+                }
+            lock = self._refresh_locks[agent_id] = asyncio.Lock()
+        return lock
+    
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task):
+        """Surface errors from background token refreshes"""
+        if not task.cancelled() and task.exception():
+            logger.warning("Background Google token refresh failed: %s", task.exception())
+    
     async def create_viewing_event(
         self,
         agent_id: str,
@@ -188,79 +419,174 @@ class GoogleCalendarService:
         Create a Google Calendar event for property viewing
         """
         try:
-            credentials = await self._get_agent_credentials(agent_id)
-            if not credentials:
+            # Credentials and property details are independent, so fetch them together
+            service, properties_by_id = await asyncio.gather(
+                self._get_service(agent_id),
+                self._get_properties_info([viewing_data["property_id"]])
+            )
+            if not service:
                 raise Exception("Agent Google Calendar not connected")
             
-            service = build('calendar', 'v3', credentials=credentials)
-            
-            # Parse viewing date and time
-            viewing_date = viewing_data["scheduled_date"]
-            viewing_time = viewing_data["scheduled_time"]
-            duration_minutes = viewing_data.get("duration_minutes", 30)
-            
-            # Create datetime objects
-            start_datetime = datetime.fromisoformat(f"{viewing_date}T{viewing_time}")
-            end_datetime = start_datetime + timedelta(minutes=duration_minutes)
-            
-            # Get property information for event details
-            property_result = supabase_client.table("properties").select("title, address").eq("id", viewing_data["property_id"]).execute()
-            property_info = property_result.data[0] if property_result.data else {}
-            
-            # Create event
-            event = {
-                'summary': f'Property Viewing - {property_info.get("title", "Property")}',
-                'description': (
-                    f"Property Viewing\n\n"
-                    f"Property: {property_info.get('title', 'N/A')}\n"
-                    f"Address: {property_info.get('address', 'N/A')}\n"
-                    f"Applicant: {viewing_data.get('applicant_name', 'N/A')}\n"
-                    f"Phone: {viewing_data.get('applicant_phone', 'N/A')}\n"
-                    f"Email: {viewing_data.get('applicant_email', 'N/A')}\n"
-                    f"Attendees: {viewing_data.get('number_of_attendees', 1)}\n"
-                    f"Type: {viewing_data.get('viewing_type', 'in_person').replace('_', ' ').title()}"
-                ),
-                'start': {
-                    'dateTime': start_datetime.isoformat(),
-                    'timeZone': 'Asia/Dubai',
-                },
-                'end': {
-                    'dateTime': end_datetime.isoformat(),
-                    'timeZone': 'Asia/Dubai',
-                },
-                'location': property_info.get('address', ''),
-                'attendees': [
-                    {'email': viewing_data.get('applicant_email')},
-                ],
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},  # 1 day before
-                        {'method': 'popup', 'minutes': 60},       # 1 hour before
-                    ],
-                },
-                'conferenceData': self._create_meeting_link(viewing_data) if viewing_data.get('viewing_type') == 'virtual' else None
-            }
+            property_info = properties_by_id.get(viewing_data["property_id"], {})
+            
+            event = self._build_viewing_event(viewing_data, property_info)
             
             # Create event in Google Calendar
-            created_event = service.events().insert(calendarId='primary', body=event).execute()
+            created_event = await self._run_blocking(
+                service.events().insert(calendarId='primary', body=event).execute
+            )
             
-            # Update viewing record with calendar event ID
-            await self._update_viewing_with_calendar_event(viewing_data["viewing_id"], created_event['id'])
+            # Record the calendar event ID on the viewing without holding up the response
+            update_task = asyncio.create_task(
+                self._update_viewing_with_calendar_event(viewing_data["viewing_id"], created_event['id'])
+            )
+            self._pending_updates.add(update_task)
+            update_task.add_done_callback(self._pending_updates.discard)
             
-            return {
-                "calendar_event_id": created_event['id'],
-                "event_link": created_event.get('htmlLink'),
-                "meeting_link": created_event.get('conferenceData', {}).get('entryPoints', [{}])[0].get('uri') if viewing_data.get('viewing_type') == 'virtual' else None
-            }
+            return self._created_event_result(created_event, viewing_data)
             
         except HttpError as e:
-            logger.error(f"Google Calendar API error: {e}")
-            raise Exception(f"Failed to create calendar event: {e}")
+            logger.error("Google Calendar API error: %s", e)
+            raise
         except Exception as e:
-            logger.error(f"Calendar service error: {e}")
+            logger.error("Calendar service error: %s", e)
             raise
     
+    async def create_viewing_events_bulk(
+        self,
+        agent_id: str,
+        viewings: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create Google Calendar events for several viewings using batched API requests
+        """
+        if not viewings:
+            return []
+        
+        try:
+            service = await self._get_service(agent_id)
+            if not service:
+                raise Exception("Agent Google Calendar not connected")
+            
+            # At most one properties query for every viewing in the batch
+            properties_by_id = await self._get_properties_info({v["property_id"] for v in viewings})
+            
+            created_events: Dict[str, Dict[str, Any]] = {}
+            errors: Dict[str, str] = {}
+            
+            def on_response(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = str(exception)
+                else:
+                    created_events[request_id] = response
+            
+            # One HTTP round-trip per batch of inserts
+            for i in range(0, len(viewings), CALENDAR_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=on_response)
+                for viewing in viewings[i:i + CALENDAR_BATCH_SIZE]:
+                    event = self._build_viewing_event(viewing, properties_by_id.get(viewing["property_id"], {}))
+                    batch.add(
+                        service.events().insert(calendarId='primary', body=event),
+                        request_id=viewing["viewing_id"]
+                    )
+                await self._run_blocking(batch.execute)
+            
+            results = []
+            for viewing in viewings:
+                viewing_id = viewing["viewing_id"]
+                created_event = created_events.get(viewing_id)
+                if created_event is None:
+                    logger.error("Google Calendar API error for viewing %s: %s", viewing_id, errors.get(viewing_id))
+                    results.append({"viewing_id": viewing_id, "error": errors.get(viewing_id)})
+                    continue
+                
+                await self._update_viewing_with_calendar_event(viewing_id, created_event['id'])
+                results.append({"viewing_id": viewing_id, **self._created_event_result(created_event, viewing)})
+            
+            return results
+            
+        except Exception as e:
+            logger.error("Calendar service error: %s", e)
+            raise
+    
+    async def _get_properties_info(self, property_ids) -> Dict[str, Dict[str, Any]]:
+        """Title and address per property id, querying only the ones not cached"""
+        properties_by_id = {}
+        missing_ids = []
+        for property_id in property_ids:
+            property_info = self._property_cache.get(property_id)
+            if property_info is None:
+                missing_ids.append(property_id)
+            else:
+                properties_by_id[property_id] = property_info
+        
+        if missing_ids:
+            property_result = await self._run_blocking(
+                supabase_client.table("properties").select("id, title, address").in_("id", missing_ids).execute
+            )
+            for property_info in property_result.data or []:
+                self._property_cache[property_info["id"]] = property_info
+                properties_by_id[property_info["id"]] = property_info
+        
+        return properties_by_id
+    
+    def _build_viewing_event(self, viewing_data: Dict[str, Any], property_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Calendar event body for a viewing"""
+        # Parse viewing date and time
+        viewing_date = viewing_data["scheduled_date"]
+        viewing_time = viewing_data["scheduled_time"]
+        duration_minutes = viewing_data.get("duration_minutes", 30)
+        
+        # Create datetime objects
+        start_datetime = _dubai_datetime(viewing_date, viewing_time)
+        end_datetime = start_datetime + timedelta(minutes=duration_minutes)
+        
+        viewing_type = viewing_data.get('viewing_type', 'in_person')
+        
+        return {
+            'summary': f'Property Viewing - {property_info.get("title", "Property")}',
+            'description': "\n".join((
+                "Property Viewing",
+                "",
+                f"Property: {property_info.get('title', 'N/A')}",
+                f"Address: {property_info.get('address', 'N/A')}",
+                f"Applicant: {viewing_data.get('applicant_name', 'N/A')}",
+                f"Phone: {viewing_data.get('applicant_phone', 'N/A')}",
+                f"Email: {viewing_data.get('applicant_email', 'N/A')}",
+                f"Attendees: {viewing_data.get('number_of_attendees', 1)}",
+                f"Type: {viewing_type.replace('_', ' ').title()}"
+            )),
+            'start': {
+                'dateTime': start_datetime.isoformat(),
+                'timeZone': DUBAI_TZ_NAME,
+            },
+            'end': {
+                'dateTime': end_datetime.isoformat(),
+                'timeZone': DUBAI_TZ_NAME,
+            },
+            'location': property_info.get('address', ''),
+            'attendees': [
+                {'email': viewing_data.get('applicant_email')},
+            ],
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},  # 1 day before
+                    {'method': 'popup', 'minutes': 60},       # 1 hour before
+                ],
+            },
+            'conferenceData': self._create_meeting_link(viewing_data) if viewing_data.get('viewing_type') == 'virtual' else None
+        }
+    
+    @staticmethod
+    def _created_event_result(created_event: Dict[str, Any], viewing_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize a created Calendar event for API responses"""
+        return {
+            "calendar_event_id": created_event['id'],
+            "event_link": created_event.get('htmlLink'),
+            "meeting_link": created_event.get('conferenceData', {}).get('entryPoints', [{}])[0].get('uri') if viewing_data.get('viewing_type') == 'virtual' else None
+        }
+    
     def _create_meeting_link(self, viewing_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create Google Meet conference data for virtual viewings"""
         return {
@@ -275,40 +601,39 @@ class GoogleCalendarService:
     async def _update_viewing_with_calendar_event(self, viewing_id: str, calendar_event_id: str):
         """Update viewing record with Google Calendar event ID"""
         try:
-            supabase_client.table("property_viewings").update({
+            await self._run_blocking(supabase_client.table("property_viewings").update({
                 "google_calendar_event_id": calendar_event_id,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", viewing_id).execute()
+                "updated_at": _now_iso()
+            }).eq("id", viewing_id).execute)
         except Exception as e:
-            logger.error(f"Failed to update viewing with calendar event: {e}")
+            logger.error("Failed to update viewing with calendar event: %s", e)
     
     async def update_viewing_event(
         self,
         agent_id: str,
         viewing_id: str,
-        viewing_data: Dict[str, Any]
+        viewing_data: Dict[str, Any],
+        calendar_event_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Update an existing Google Calendar event for property viewing
+        
+        Pass calendar_event_id when the viewing row is already loaded to skip re-reading it.
         """
         try:
-            # Get viewing record with calendar event ID
-            viewing_result = supabase_client.table("property_viewings").select("google_calendar_event_id").eq("id", viewing_id).execute()
+            if calendar_event_id is None:
+                calendar_event_id = await self._get_viewing_calendar_event_id(viewing_id)
             
-            if not viewing_result.data or not viewing_result.data[0].get("google_calendar_event_id"):
+            if not calendar_event_id:
                 # No calendar event exists, create new one
                 return await self.create_viewing_event(agent_id, {**viewing_data, "viewing_id": viewing_id})
             
-            calendar_event_id = viewing_result.data[0]["google_calendar_event_id"]
-            
-            credentials = await self._get_agent_credentials(agent_id)
-            if not credentials:
+            service = await self._get_service(agent_id)
+            if not service:
                 raise Exception("Agent Google Calendar not connected")
             
-            service = build('calendar', 'v3', credentials=credentials)
-            
             # Get existing event
-            existing_event = service.events().get(calendarId='primary', eventId=calendar_event_id).execute()
+            existing_event = await self._run_blocking(service.events().get(calendarId='primary', eventId=calendar_event_id).execute)
             
             # Update event with new data
             if "scheduled_date" in viewing_data or "scheduled_time" in viewing_data:
@@ -316,14 +641,14 @@ class GoogleCalendarService:
                 viewing_time = viewing_data.get("scheduled_time", existing_event['start']['dateTime'][11:19])
                 duration_minutes = viewing_data.get("duration_minutes", 30)
                 
-                start_datetime = datetime.fromisoformat(f"{viewing_date}T{viewing_time}")
+                start_datetime = _dubai_datetime(viewing_date, viewing_time)
                 end_datetime = start_datetime + timedelta(minutes=duration_minutes)
                 
                 existing_event['start']['dateTime'] = start_datetime.isoformat()
                 existing_event['end']['dateTime'] = end_datetime.isoformat()
             
             # Update event
-            updated_event = service.events().update(calendarId='primary', eventId=calendar_event_id, body=existing_event).execute()
+            updated_event = await self._run_blocking(service.events().update(calendarId='primary', eventId=calendar_event_id, body=existing_event).execute)
             
             return {
                 "calendar_event_id": updated_event['id'],
@@ -332,43 +657,49 @@ class GoogleCalendarService:
             }
             
         except HttpError as e:
-            logger.error(f"Google Calendar API error: {e}")
-            raise Exception(f"Failed to update calendar event: {e}")
+            logger.error("Google Calendar API error: %s", e)
+            raise
         except Exception as e:
-            logger.error(f"Calendar service error: {e}")
+            logger.error("Calendar service error: %s", e)
             raise
     
+    async def _get_viewing_calendar_event_id(self, viewing_id: str) -> Optional[str]:
+        """Calendar event ID recorded on the viewing, if any"""
+        viewing_result = await self._run_blocking(supabase_client.table("property_viewings").select("google_calendar_event_id").eq("id", viewing_id).execute)
+        if not viewing_result.data:
+            return None
+        return viewing_result.data[0].get("google_calendar_event_id")
+    
     async def cancel_viewing_event(
         self,
         agent_id: str,
-        viewing_id: str
+        viewing_id: str,
+        calendar_event_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Cancel a Google Calendar event for property viewing
+        
+        Pass calendar_event_id when the viewing row is already loaded to skip re-reading it.
         """
         try:
-            # Get viewing record with calendar event ID
-            viewing_result = supabase_client.table("property_viewings").select("google_calendar_event_id").eq("id", viewing_id).execute()
+            if calendar_event_id is None:
+                calendar_event_id = await self._get_viewing_calendar_event_id(viewing_id)
             
-            if not viewing_result.data or not viewing_result.data[0].get("google_calendar_event_id"):
+            if not calendar_event_id:
                 return {"message": "No calendar event to cancel"}
             
-            calendar_event_id = viewing_result.data[0]["google_calendar_event_id"]
-            
-            credentials = await self._get_agent_credentials(agent_id)
-            if not credentials:
+            service = await self._get_service(agent_id)
+            if not service:
                 raise Exception("Agent Google Calendar not connected")
             
-            service = build('calendar', 'v3', credentials=credentials)
-            
             # Delete event from Google Calendar
-            service.events().delete(calendarId='primary', eventId=calendar_event_id).execute()
+            await self._run_blocking(service.events().delete(calendarId='primary', eventId=calendar_event_id).execute)
             
             # Clear calendar event ID from viewing record
-            supabase_client.table("property_viewings").update({
+            await self._run_blocking(supabase_client.table("property_viewings").update({
                 "google_calendar_event_id": None,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", viewing_id).execute()
+                "updated_at": _now_iso()
+            }).eq("id", viewing_id).execute)
             
             return {
                 "cancelled": True,
@@ -376,10 +707,10 @@ class GoogleCalendarService:
             }
             
         except HttpError as e:
-            logger.error(f"Google Calendar API error: {e}")
-            raise Exception(f"Failed to cancel calendar event: {e}")
+            logger.error("Google Calendar API error: %s", e)
+            raise
         except Exception as e:
-            logger.error(f"Calendar service error: {e}")
+            logger.error("Calendar service error: %s", e)
             raise
     
     async def get_agent_availability(
@@ -392,25 +723,23 @@ class GoogleCalendarService:
         Get agent availability from Google Calendar
         """
         try:
-            credentials = await self._get_agent_credentials(agent_id)
-            if not credentials:
+            service = await self._get_service(agent_id)
+            if not service:
                 return []  # Return empty if calendar not connected
             
-            service = build('calendar', 'v3', credentials=credentials)
-            
             # Get busy times from Google Calendar
             freebusy_request = {
                 'timeMin': start_date.isoformat(),
                 'timeMax': end_date.isoformat(),
-                'timeZone': 'Asia/Dubai',
+                'timeZone': DUBAI_TZ_NAME,
                 'items': [{'id': 'primary'}]
             }
             
-            freebusy_result = service.freebusy().query(body=freebusy_request).execute()
+            freebusy_result = await self._run_blocking(service.freebusy().query(body=freebusy_request).execute)
             busy_times = freebusy_result['calendars']['primary']['busy']
             
             # Get agent's working hours
-            agent_result = supabase_client.table("agents").select("working_hours").eq("id", agent_id).execute()
+            agent_result = await self._run_blocking(supabase_client.table("agents").select("working_hours").eq("id", agent_id).execute)
             working_hours = agent_result.data[0]['working_hours'] if agent_result.data else {}
             
             # Generate available slots
@@ -424,10 +753,10 @@ class GoogleCalendarService:
             return available_slots
             
         except HttpError as e:
-            logger.error(f"Google Calendar API error: {e}")
+            logger.error("Google Calendar API error: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Calendar service error: {e}")
+            logger.error("Calendar service error: %s", e)
             return []
     
     def _generate_available_slots(
@@ -450,6 +779,26 @@ class GoogleCalendarService:
         }
         
         working_hours = {**default_working_hours, **working_hours}
+        working_days = set(working_hours.get("days", []))
+        work_start_time = datetime.strptime(working_hours["start"], "%H:%M").time()
+        work_end_time = datetime.strptime(working_hours["end"], "%H:%M").time()
+        
+        # Every working day has the same 30-minute grid, so lay it out once as
+        # offsets from the start of the working day
+        working_seconds = (
+            datetime.combine(start_date.date(), work_end_time)
+            - datetime.combine(start_date.date(), work_start_time)
+        ).total_seconds()
+        slot_offsets = [
+            (offset, timedelta(seconds=offset), timedelta(seconds=offset + SLOT_SECONDS))
+            for offset in range(0, int(working_seconds) - SLOT_SECONDS + 1, SLOT_SECONDS)
+        ]
+        
+        # Busy periods as sorted, non-overlapping (start, end) epoch seconds. Slots are
+        # generated in order, so one cursor sweeps them instead of rescanning per slot.
+        busy_intervals = self._merge_busy_intervals(busy_times)
+        busy_count = len(busy_intervals)
+        busy_index = 0
         
         current_date = start_date.date()
         end_date_only = end_date.date()
@@ -457,69 +806,72 @@ class GoogleCalendarService:
         while current_date <= end_date_only:
             day_name = current_date.strftime('%A').lower()
             
-            if day_name in working_hours.get("days", []):
-                # Create time slots for this day
-                work_start = datetime.combine(current_date, datetime.strptime(working_hours["start"], "%H:%M").time())
-                work_end = datetime.combine(current_date, datetime.strptime(working_hours["end"], "%H:%M").time())
+            if day_name in working_days:
+                # Working hours are Dubai local time
+                work_start = datetime.combine(current_date, work_start_time)
+                work_start_ts = work_start.replace(tzinfo=DUBAI_TZ).timestamp()
                 
-                # Generate 30-minute slots
-                current_slot = work_start
-                while current_slot + timedelta(minutes=30) <= work_end:
-                    slot_end = current_slot + timedelta(minutes=30)
+                for offset, start_offset, end_offset in slot_offsets:
+                    slot_start_ts = work_start_ts + offset
+                    slot_end_ts = slot_start_ts + SLOT_SECONDS
                     
-                    # Check if slot conflicts with busy times
-                    is_available = not self._slot_conflicts_with_busy_times(
-                        current_slot, 
-                        slot_end, 
-                        busy_times
-                    )
+                    # Skip busy periods that end before this slot starts
+                    while busy_index < busy_count and busy_intervals[busy_index][1] <= slot_start_ts:
+                        busy_index += 1
                     
-                    if is_available:
+                    if busy_index == busy_count or busy_intervals[busy_index][0] >= slot_end_ts:
                         available_slots.append({
-                            "start_time": current_slot.isoformat(),
-                            "end_time": slot_end.isoformat(),
+                            "start_time": (work_start + start_offset).isoformat(),
+                            "end_time": (work_start + end_offset).isoformat(),
                             "duration_minutes": 30,
                             "available": True
                         })
-                    
-                    current_slot = slot_end
             
             current_date += timedelta(days=1)
         
         return available_slots
     
-    def _slot_conflicts_with_busy_times(
-        self,
-        slot_start: datetime,
-        slot_end: datetime,
-        busy_times: List[Dict[str, str]]
-    ) -> bool:
-        """Check if a time slot conflicts with busy times"""
-        for busy_period in busy_times:
-            busy_start = datetime.fromisoformat(busy_period['start'].replace('Z', '+00:00'))
-            busy_end = datetime.fromisoformat(busy_period['end'].replace('Z', '+00:00'))
-            
-            # Check for overlap
-            if (slot_start < busy_end and slot_end > busy_start):
-                return True
+    @staticmethod
+    def _merge_busy_intervals(busy_times: List[Dict[str, str]]) -> List[Tuple[float, float]]:
+        """Parse free/busy periods once into sorted, merged (start, end) epoch seconds"""
+        intervals = sorted(
+            (_parse_busy_time(busy_period['start']), _parse_busy_time(busy_period['end']))
+            for busy_period in busy_times
+        )
         
-        return False
+        merged: List[Tuple[float, float]] = []
+        for busy_start, busy_end in intervals:
+            if merged and busy_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], busy_end))
+            else:
+                merged.append((busy_start, busy_end))
+        return merged
+    
+    async def drain_pending_updates(self):
+        """Wait for background viewing writes to finish (called on shutdown)"""
+        if self._pending_updates:
+            await asyncio.gather(*list(self._pending_updates), return_exceptions=True)
     
     async def sync_agent_availability(self, agent_id: str) -> Dict[str, Any]:
         """
         Sync agent's availability with Google Calendar and update database
         """
         try:
+            # Nothing to sync, and existing slots are left alone, until a calendar is connected
+            if not await self.is_calendar_connected(agent_id):
+                return {
+                    "agent_id": agent_id,
+                    "synced_slots": 0,
+                    "sync_date": _now_iso()
+                }
+            
             # Get next 30 days availability
             start_date = datetime.now()
             end_date = start_date + timedelta(days=30)
             
             available_slots = await self.get_agent_availability(agent_id, start_date, end_date)
             
-            # Clear existing availability
-            supabase_client.table("agent_availability").delete().eq("agent_id", agent_id).gte("date", start_date.date().isoformat()).execute()
-            
-            # Insert new availability slots
+            # Upsert the current slots, keyed on (agent_id, date, start_time)
             availability_records = []
             for slot in available_slots:
                 slot_start = datetime.fromisoformat(slot['start_time'])
@@ -533,22 +885,35 @@ class GoogleCalendarService:
                     "is_available": True,
                     "max_viewings": 3,
                     "current_bookings": 0,
-                    "slot_type": "regular",
-                    "created_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
+                    "slot_type": "regular"
                 })
             
+            existing_result = await self._run_blocking(
+                supabase_client.table("agent_availability").select("id, date, start_time").eq("agent_id", agent_id).gte("date", start_date.date().isoformat()).execute
+            )
+            
             if availability_records:
-                supabase_client.table("agent_availability").insert(availability_records).execute()
+                await self._run_blocking(
+                    supabase_client.table("agent_availability").upsert(availability_records, on_conflict="agent_id,date,start_time").execute
+                )
+            
+            # Only remove slots that are no longer free, so the agent is never left without availability
+            current_slots = {(record["date"], record["start_time"]) for record in availability_records}
+            stale_ids = [
+                row["id"] for row in existing_result.data or []
+                if (row["date"], row["start_time"]) not in current_slots
+            ]
+            if stale_ids:
+                await self._run_blocking(supabase_client.table("agent_availability").delete().in_("id", stale_ids).execute)
             
             return {
                 "agent_id": agent_id,
                 "synced_slots": len(availability_records),
-                "sync_date": datetime.utcnow().isoformat()
+                "sync_date": _now_iso()
             }
             
         except Exception as e:
-            logger.error(f"Failed to sync agent availability: {e}")
+            logger.error("Failed to sync agent availability: %s", e)
             raise
 
 
@@ -3,8 +3,13 @@ S3 Storage Service for handling file uploads
 """
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, BinaryIO, Union
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import uuid
 import logging
 from PIL import Image
@@ -14,63 +19,277 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Images from one request uploaded to S3 at the same time
+IMAGE_UPLOAD_CONCURRENCY = 8
+
+# Connections kept to S3: concurrent uploads x size variants, plus multipart part threads
+S3_MAX_POOL_CONNECTIONS = 64
+
+# Objects at least this large are uploaded in parallel parts; smaller ones in a single PutObject.
+# The threshold matches the part size so multipart never sends a lone part, which also keeps
+# every image under the 10MB upload cap on the PutObject path.
+S3_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+# Bigger parts for large admin/bulk uploads: fewer requests per object
+S3_LARGE_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD,
+    multipart_chunksize=50 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Smaller variants stored next to each uploaded image: (label, longest side in px)
+IMAGE_VARIANT_SIZES = (
+    ("thumb", 256),
+    ("medium", 1024),
+)
+_VARIANT_SUFFIXES = tuple(f"_{label}" for label, _ in IMAGE_VARIANT_SIZES)
+
+# Largest source image decoded (covers 48MP phone cameras); anything bigger is rejected
+# as a likely decompression bomb rather than stored
+MAX_SOURCE_PIXELS = 50_000_000
+
+# WebP uploads within the size limits and under this many bytes per pixel are stored as-is
+# instead of being re-encoded (uploads are converted to WebP, so other formats never match)
+ALREADY_OPTIMIZED_BYTES_PER_PIXEL = 0.5
+_PASSTHROUGH_FORMATS = {'.webp': 'WEBP'}
+
+# Resized JPEGs still larger than this are re-encoded at the fallback quality
+JPEG_SIZE_THRESHOLD = 1024 * 1024
+JPEG_FALLBACK_QUALITY = 75
+
+# Pillow releases the GIL while decoding, resizing and encoding, so image work
+# runs here in parallel instead of stalling the event loop
+_image_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="image-processing")
+
+
+def _save_jpeg(image: Image.Image, output: io.BytesIO, quality: int):
+    """Progressive, optimized JPEG, stepping quality down for unusually heavy images"""
+    image.save(output, format='JPEG', quality=quality, optimize=True, progressive=True)
+    if output.tell() > JPEG_SIZE_THRESHOLD and quality > JPEG_FALLBACK_QUALITY:
+        output.seek(0)
+        output.truncate()
+        image.save(output, format='JPEG', quality=JPEG_FALLBACK_QUALITY, optimize=True, progressive=True)
+
+
+def _encode_image(image: Image.Image, file_extension: str, quality: int) -> io.BytesIO:
+    """Encode an image in the format for its file extension, rewound for uploading"""
+    output = io.BytesIO()
+    
+    if file_extension.lower() in ['.jpg', '.jpeg']:
+        _save_jpeg(image, output, quality)
+    elif file_extension.lower() == '.png':
+        image.save(output, format='PNG', optimize=True)
+    elif file_extension.lower() == '.webp':
+        image.save(output, format='WEBP', quality=quality, method=6)
+    else:
+        # Default to JPEG
+        _save_jpeg(image, output, quality)
+    
+    # Hand the buffer itself to boto3 rather than copying it out with getvalue()
+    output.seek(0)
+    return output
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    """Length of a seekable file or buffer without reading or copying it"""
+    position = stream.tell()
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(position)
+    return size
+
+
+def _content_digest(stream: BinaryIO) -> str:
+    """BLAKE2b digest of a file's content, read in 1MB chunks (blocking)"""
+    digest = hashlib.blake2b(digest_size=16)
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _process_image_sync(
+    source: BinaryIO,
+    file_extension: str,
+    max_width: int,
+    max_height: int,
+    quality: int
+) -> Dict[str, io.BytesIO]:
+    """
+    Resize and re-encode an image into its size variants (runs on the image executor).
+    Returns an empty dict if the image can't be processed, and raises
+    Image.DecompressionBombError for images too large to decode.
+    """
+    try:
+        # Open image (reads the header only; pixels are decoded on first use)
+        source.seek(0)
+        image = Image.open(source)
+        
+        # Check dimensions before decoding, so a tiny file can't expand into gigabytes of pixels
+        if image.width * image.height > MAX_SOURCE_PIXELS:
+            raise Image.DecompressionBombError(
+                f"Image too large: {image.width}x{image.height} exceeds {MAX_SOURCE_PIXELS} pixels"
+            )
+        
+        # Web-ready uploads keep their bytes; EXIF (e.g. camera GPS) is only stripped by re-encoding
+        keep_original = (
+            image.format == _PASSTHROUGH_FORMATS.get(file_extension.lower())
+            and image.width <= max_width and image.height <= max_height
+            and _stream_size(source) <= image.width * image.height * ALREADY_OPTIMIZED_BYTES_PER_PIXEL
+            and 'exif' not in image.info
+        )
+        
+        # Let libjpeg decode large JPEGs straight at 1/2, 1/4 or 1/8 scale, staying at least
+        # twice the target size so the LANCZOS resize below still has detail to work with
+        if image.format == 'JPEG':
+            image.draft('RGB', (max_width * 2, max_height * 2))
+        
+        # Convert to RGB if necessary
+        if image.mode in ('RGBA', 'P'):
+            image = image.convert('RGB')
+        
+        # Resize if too large
+        if image.width > max_width or image.height > max_height:
+            image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        
+        variants = {"full": source if keep_original else _encode_image(image, file_extension, quality)}
+        
+        # Smaller variants scale down the already-resized image, so the upload is decoded once
+        for label, max_side in IMAGE_VARIANT_SIZES:
+            variant = image.copy()
+            variant.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            variants[label] = _encode_image(variant, file_extension, quality)
+        
+        return variants
+        
+    except Image.DecompressionBombError:
+        raise
+    except Exception as e:
+        logger.warning(f"Image processing failed, using original: {e}")
+        return {}
+
+
+def _variant_key(s3_key: str, label: str) -> str:
+    """S3 key of a size variant stored next to the full image"""
+    root, extension = os.path.splitext(s3_key)
+    return f"{root}_{label}{extension}"
+
+
 class S3StorageService:
     def __init__(self):
         self.bucket_name = settings.s3_bucket_name
         self.region = settings.aws_region
+        self._upload_semaphore = asyncio.Semaphore(IMAGE_UPLOAD_CONCURRENCY)
+        self._verified = False
+        
+        # Public URLs only depend on configuration, so pick their format once (Supabase or AWS)
+        if settings.s3_endpoint_url:
+            self._url_template = f"{settings.supabase_url.rstrip('/')}/storage/v1/object/public/{self.bucket_name}/{{key}}"
+        else:
+            self._url_template = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{{key}}"
         
         # Check if S3 configuration is available
         if not self.bucket_name or not settings.aws_access_key_id or not settings.aws_secret_access_key:
             logger.warning("S3 configuration incomplete. S3 service disabled. Required: S3_BUCKET_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY")
-            self.s3_client = None
+            self._client_config = None
+        else:
+            self._client_config = self._build_client_config()
+        
+        # The client itself is created lazily in each process: with gunicorn's preload_app this
+        # module is imported in the master, and connection pools must not be shared across a fork
+        self._client = None
+        self._client_pid = None
+    
+    def _build_client_config(self) -> Dict[str, Any]:
+        client_config = {
+            'aws_access_key_id': settings.aws_access_key_id,
+            'aws_secret_access_key': settings.aws_secret_access_key,
+            'region_name': self.region
+        }
+        
+        # Add endpoint URL for Supabase S3-compatible storage
+        if settings.s3_endpoint_url:
+            client_config['endpoint_url'] = settings.s3_endpoint_url
+        
+        # One client is shared by every upload thread (boto3 clients are thread-safe), so size
+        # its pool for them and keep idle connections alive instead of re-handshaking TLS
+        client_config['config'] = Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+            tcp_keepalive=True,
+            # Supabase's S3 endpoint only supports path-style addressing
+            s3={'addressing_style': 'path' if settings.s3_endpoint_url else 'virtual'}
+        )
+        return client_config
+    
+    @property
+    def s3_client(self):
+        """S3 client for the current process, or None if S3 is not configured"""
+        if self._client_config is None:
+            return None
+        
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            # Initialize S3 client (Supabase S3-compatible)
+            try:
+                # No connection test here: workers are recycled often, and a blocking round-trip
+                # would delay every cold start (see verify_bucket, run in the background at startup)
+                self._client = boto3.client('s3', **self._client_config)
+                self._client_pid = pid
+            except NoCredentialsError:
+                logger.warning("AWS credentials not found. S3 service disabled.")
+                self._client_config = None
+                return None
+            except ClientError as e:
+                logger.error(f"S3 initialization failed: {e}")
+                self._client_config = None
+                return None
+            except Exception as e:
+                logger.error(f"S3 service initialization failed: {e}")
+                self._client_config = None
+                return None
+        
+        return self._client
+    
+    async def verify_bucket(self):
+        """Check the bucket is reachable, once per process; failures are logged, not raised"""
+        if not self.s3_client or self._verified:
             return
         
-        # Initialize S3 client (Supabase S3-compatible)
         try:
-            client_config = {
-                'aws_access_key_id': settings.aws_access_key_id,
-                'aws_secret_access_key': settings.aws_secret_access_key,
-                'region_name': self.region
-            }
-            
-            # Add endpoint URL for Supabase S3-compatible storage
-            if settings.s3_endpoint_url:
-                client_config['endpoint_url'] = settings.s3_endpoint_url
-            
-            self.s3_client = boto3.client('s3', **client_config)
-            
-            # Test connection only if bucket name is valid
-            if self.bucket_name:
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
-                logger.info(f"S3 connection established for bucket: {self.bucket_name}")
-            
-        except NoCredentialsError:
-            logger.warning("AWS credentials not found. S3 service disabled.")
-            self.s3_client = None
-        except ClientError as e:
-            logger.error(f"S3 initialization failed: {e}")
-            self.s3_client = None
+            await asyncio.to_thread(self.s3_client.head_bucket, Bucket=self.bucket_name)
+            self._verified = True
+            logger.info(f"S3 connection established for bucket: {self.bucket_name}")
         except Exception as e:
-            logger.error(f"S3 service initialization failed: {e}")
-            self.s3_client = None
+            logger.error(f"S3 bucket check failed: {e}")
     
     async def upload_property_image(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
         user_id: str,
         property_id: str,
         filename: str,
-        content_type: str = "image/jpeg"
+        content_type: str = "image/jpeg",
+        convert_to_webp: bool = True
     ) -> Dict[str, Any]:
         """
-        Upload property image to S3
+        Upload property image to S3 through the backend
+        
+        Clients should prefer generate_presigned_upload_url + confirm_presigned_upload, which keep
+        image bytes off the API; this path remains for admin tools and migrations.
         
         Args:
-            file_content: Image file content as bytes
+            file_content: Image bytes, or a seekable file (e.g. UploadFile.file) streamed from disk
             user_id: User ID for organizing files
             property_id: Property ID for organizing files
             filename: Original filename
             content_type: MIME type of the file
+            convert_to_webp: Store the image as WebP rather than in its original format
             
         Returns:
             Dict with upload result including URL
@@ -78,50 +297,170 @@ class S3StorageService:
         if not self.s3_client:
             return {"error": "S3 service not available", "url": None}
         
+        # Spooled upload files are read straight from disk instead of being loaded into memory
+        source = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
+        
+        # Reject bad types and oversized files before paying for a decode
+        validation = self._validate_image_file(content_type, _stream_size(source))
+        if not validation["valid"]:
+            return {"error": validation["error"], "url": None}
+        
         try:
-            # Generate unique filename
             file_extension = os.path.splitext(filename)[1].lower()
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            
-            # Create S3 key
-            s3_key = f"properties/{user_id}/{property_id}/{unique_filename}"
+            target_extension = '.webp' if convert_to_webp else file_extension
+            
+            # Keys are derived from the upload's content, so re-uploading an image already stored
+            # for this property skips processing and the PUTs entirely
+            content_digest = await asyncio.to_thread(_content_digest, source)
+            key_prefix = f"properties/{user_id}/{property_id}/{content_digest}"
+            existing = await self._head_object(f"{key_prefix}{target_extension}")
+            if existing:
+                s3_key = f"{key_prefix}{target_extension}"
+                # Only link the size variants that upload actually wrote (none if processing failed)
+                stored_variants = existing.get('Metadata', {}).get('variants', '')
+                return {
+                    "url": self.public_url(s3_key),
+                    "s3_key": s3_key,
+                    "size": existing['ContentLength'],
+                    "content_type": existing.get('ContentType', content_type),
+                    "urls": {
+                        "full": self.public_url(s3_key),
+                        **{
+                            label: self.public_url(_variant_key(s3_key, label))
+                            for label in stored_variants.split(",") if label
+                        }
+                    }
+                }
             
             # Process and optimize image
-            processed_content = await self._process_image(file_content, file_extension)
+            variants = await self._process_image(source, target_extension)
+            if variants:
+                file_extension = target_extension
+                if convert_to_webp:
+                    content_type = 'image/webp'
+            else:
+                # Processing failed: store the original bytes, in their original format
+                variants = {"full": source}
+            processed_content = variants["full"]
             
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=processed_content,
-                ContentType=content_type,
-                CacheControl='max-age=31536000',  # 1 year cache
-                Metadata={
+            # Create S3 key
+            s3_key = f"{key_prefix}{file_extension}"
+            
+            object_args = {
+                'ContentType': content_type,
+                'CacheControl': 'max-age=31536000',  # 1 year cache
+                'Metadata': {
                     'user_id': user_id,
                     'property_id': property_id,
-                    'original_filename': filename
+                    'original_filename': filename,
+                    # Size variants stored next to this image, for the duplicate-upload check above
+                    'variants': ",".join(label for label in variants if label != "full")
                 }
-            )
+            }
             
-            # Generate URL (Supabase or AWS)
-            if settings.s3_endpoint_url:
-                # Supabase URL format
-                image_url = f"https://bpomacnqaqzgeuahhlka.supabase.co/storage/v1/object/public/{self.bucket_name}/{s3_key}"
-            else:
-                # Standard AWS S3 URL format
-                image_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
+            variant_keys = {
+                label: s3_key if label == "full" else _variant_key(s3_key, label)
+                for label in variants
+            }
+            
+            # Upload every size variant to S3 concurrently
+            await asyncio.gather(*(
+                self._put_image(variant_keys[label], content, object_args)
+                for label, content in variants.items()
+            ))
             
             return {
-                "url": image_url,
+                "url": self.public_url(s3_key),
                 "s3_key": s3_key,
-                "size": len(processed_content),
-                "content_type": content_type
+                "size": _stream_size(processed_content),
+                "content_type": content_type,
+                "urls": {label: self.public_url(key) for label, key in variant_keys.items()}
             }
             
         except Exception as e:
             logger.error(f"Image upload failed: {e}")
             return {"error": str(e), "url": None}
     
+    async def _head_object(self, s3_key: str) -> Optional[Dict[str, Any]]:
+        """Object metadata, or None if the key doesn't exist"""
+        try:
+            return await asyncio.to_thread(self.s3_client.head_object, Bucket=self.bucket_name, Key=s3_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+    
+    async def _put_image(self, s3_key: str, content: BinaryIO, object_args: Dict[str, Any]):
+        """Upload one processed image to S3 off the event loop"""
+        content.seek(0)
+        if _stream_size(content) >= S3_MULTIPART_THRESHOLD:
+            await asyncio.to_thread(
+                self.s3_client.upload_fileobj,
+                content,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs=object_args,
+                Config=S3_TRANSFER_CONFIG
+            )
+        else:
+            await asyncio.to_thread(
+                self.s3_client.put_object,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Body=content,
+                **object_args
+            )
+    
+    def public_url(self, s3_key: str) -> str:
+        """Public URL of an S3 object (Supabase or AWS)"""
+        return self._url_template.format(key=s3_key)
+    
+    async def confirm_presigned_upload(
+        self,
+        s3_key: str,
+        user_id: str,
+        property_id: str
+    ) -> Dict[str, Any]:
+        """
+        Confirm an image the client uploaded directly to S3 with a presigned URL
+        
+        Args:
+            s3_key: S3 object key returned with the presigned URL
+            user_id: User ID for authorization
+            property_id: Property ID the image was uploaded for
+            
+        Returns:
+            Dict with the stored image's URL, size and content type
+        """
+        if not self.s3_client:
+            return {"error": "S3 service not available", "url": None}
+        
+        try:
+            # Only keys issued for this user's property can be attached to it
+            if not s3_key.startswith(f"properties/{user_id}/{property_id}/"):
+                return {"error": "Unauthorized to confirm this image", "url": None}
+            
+            # HEAD the object so only uploads that actually landed are recorded
+            head = await asyncio.to_thread(
+                self.s3_client.head_object,
+                Bucket=self.bucket_name,
+                Key=s3_key
+            )
+            
+            return {
+                "url": self.public_url(s3_key),
+                "s3_key": s3_key,
+                "size": head['ContentLength'],
+                "content_type": head.get('ContentType', 'application/octet-stream')
+            }
+            
+        except ClientError as e:
+            logger.error(f"Presigned upload confirmation failed: {e}")
+            return {"error": "Uploaded image not found", "url": None}
+        except Exception as e:
+            logger.error(f"Presigned upload confirmation failed: {e}")
+            return {"error": str(e), "url": None}
+    
     async def upload_multiple_images(
         self,
         files: List[Dict[str, Any]],
@@ -132,26 +471,68 @@ class S3StorageService:
         Upload multiple property images
         
         Args:
-            files: List of file dictionaries with 'content', 'filename', 'content_type'
+            files: List of file dictionaries with 'content' (bytes or seekable file), 'filename', 'content_type'
             user_id: User ID
             property_id: Property ID
             
         Returns:
             List of upload results
         """
-        results = []
-        
-        for file_data in files:
-            result = await self.upload_property_image(
-                file_content=file_data['content'],
-                user_id=user_id,
-                property_id=property_id,
-                filename=file_data['filename'],
-                content_type=file_data.get('content_type', 'image/jpeg')
-            )
-            results.append(result)
+        async def upload_one(file_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with self._upload_semaphore:
+                return await self.upload_property_image(
+                    file_content=file_data['content'],
+                    user_id=user_id,
+                    property_id=property_id,
+                    filename=file_data['filename'],
+                    content_type=file_data.get('content_type', 'image/jpeg')
+                )
+        
+        # Uploads are independent, so run them concurrently (results keep the input order)
+        return list(await asyncio.gather(*(upload_one(file_data) for file_data in files)))
+    
+    async def upload_document(
+        self,
+        fileobj: BinaryIO,
+        s3_key: str,
+        content_type: str = "application/pdf",
+        large: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Upload a document from a file-like object to S3
+        
+        Args:
+            fileobj: Readable binary file object positioned at the start
+            s3_key: S3 object key
+            content_type: MIME type of the file
+            large: Use 50MB multipart parts (videos, bulk admin uploads)
+            
+        Returns:
+            Dict with upload result including URL
+        """
+        if not self.s3_client:
+            return {"error": "S3 service not available", "url": None}
         
-        return results
+        try:
+            # upload_fileobj reads the file in parts, so the document is never held in memory whole
+            await asyncio.to_thread(
+                self.s3_client.upload_fileobj,
+                fileobj,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={'ContentType': content_type},
+                Config=S3_LARGE_TRANSFER_CONFIG if large else S3_TRANSFER_CONFIG
+            )
+            
+            return {
+                "url": self.public_url(s3_key),
+                "s3_key": s3_key,
+                "content_type": content_type
+            }
+            
+        except Exception as e:
+            logger.error(f"Document upload failed: {e}")
+            return {"error": str(e), "url": None}
     
     async def delete_property_image(
         self,
@@ -176,10 +557,12 @@ class S3StorageService:
             if not s3_key.startswith(f"properties/{user_id}/"):
                 return {"error": "Unauthorized to delete this image", "success": False}
             
-            # Delete from S3
-            self.s3_client.delete_object(
+            # Delete the image and its size variants from S3 in one request
+            keys = [s3_key] + [_variant_key(s3_key, label) for label, _ in IMAGE_VARIANT_SIZES]
+            await asyncio.to_thread(
+                self.s3_client.delete_objects,
                 Bucket=self.bucket_name,
-                Key=s3_key
+                Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
             )
             
             return {"success": True, "message": "Image deleted successfully"}
@@ -209,21 +592,17 @@ class S3StorageService:
         try:
             prefix = f"properties/{user_id}/{property_id}/"
             
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
+            # A single ListObjectsV2 call stops at 1,000 keys, so walk every page
+            objects = await asyncio.to_thread(self._list_objects, prefix)
             
             images = []
-            for obj in response.get('Contents', []):
-                # Generate URL based on storage type
-                if settings.s3_endpoint_url:
-                    image_url = f"https://bpomacnqaqzgeuahhlka.supabase.co/storage/v1/object/public/{self.bucket_name}/{obj['Key']}"
-                else:
-                    image_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{obj['Key']}"
+            for obj in objects:
+                # Size variants belong to their full image rather than being images of their own
+                if os.path.splitext(obj['Key'])[0].endswith(_VARIANT_SUFFIXES):
+                    continue
                 
                 images.append({
-                    "url": image_url,
+                    "url": self.public_url(obj['Key']),
                     "s3_key": obj['Key'],
                     "size": obj['Size'],
                     "last_modified": obj['LastModified'].isoformat()
@@ -235,6 +614,16 @@ class S3StorageService:
             logger.error(f"Get images failed: {e}")
             return []
     
+    def _list_objects(self, prefix: str) -> List[Dict[str, Any]]:
+        """All objects under a prefix, across ListObjectsV2 pages (blocking)"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': 1000}
+        )
+        return [obj for page in pages for obj in page.get('Contents', [])]
+    
     async def generate_presigned_upload_url(
         self,
         user_id: str,
@@ -280,16 +669,10 @@ class S3StorageService:
                 ExpiresIn=expiration
             )
             
-            # Add the final URL where the image will be accessible
-            if settings.s3_endpoint_url:
-                final_url = f"https://bpomacnqaqzgeuahhlka.supabase.co/storage/v1/object/public/{self.bucket_name}/{s3_key}"
-            else:
-                final_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
-            
             return {
                 "upload_url": response['url'],
                 "fields": response['fields'],
-                "final_url": final_url,
+                "final_url": self.public_url(s3_key),
                 "s3_key": s3_key
             }
             
@@ -301,55 +684,30 @@ class S3StorageService:
     
     async def _process_image(
         self,
-        file_content: bytes,
+        source: BinaryIO,
         file_extension: str,
         max_width: int = 1920,
         max_height: int = 1080,
         quality: int = 85
-    ) -> bytes:
+    ) -> Dict[str, io.BytesIO]:
         """
         Process and optimize image
         
         Args:
-            file_content: Original image bytes
+            source: Seekable file with the original image
             file_extension: File extension
             max_width: Maximum width
             max_height: Maximum height
             quality: JPEG quality (1-100)
             
         Returns:
-            Processed image bytes
+            Processed image buffer per size variant ("full", plus IMAGE_VARIANT_SIZES labels),
+            or an empty dict if the image couldn't be processed
         """
-        try:
-            # Open image
-            image = Image.open(io.BytesIO(file_content))
-            
-            # Convert to RGB if necessary
-            if image.mode in ('RGBA', 'P'):
-                image = image.convert('RGB')
-            
-            # Resize if too large
-            if image.width > max_width or image.height > max_height:
-                image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-            
-            # Save optimized image
-            output = io.BytesIO()
-            
-            if file_extension.lower() in ['.jpg', '.jpeg']:
-                image.save(output, format='JPEG', quality=quality, optimize=True)
-            elif file_extension.lower() == '.png':
-                image.save(output, format='PNG', optimize=True)
-            elif file_extension.lower() == '.webp':
-                image.save(output, format='WEBP', quality=quality, optimize=True)
-            else:
-                # Default to JPEG
-                image.save(output, format='JPEG', quality=quality, optimize=True)
-            
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.warning(f"Image processing failed, using original: {e}")
-            return file_content
+        return await asyncio.get_running_loop().run_in_executor(
+            _image_executor, _process_image_sync,
+            source, file_extension, max_width, max_height, quality
+        )
     
     def _validate_image_file(self, content_type: str, file_size: int) -> Dict[str, Any]:
         """
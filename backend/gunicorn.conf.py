@@ -5,12 +5,17 @@ import os
 bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
 backlog = 2048
 
-# Worker processes
-workers = 1
+# Worker processes. Keep a single worker by default: the calendar credentials/connection caches
+# and DocuSign's rate limiter, status cache and pending lease updates live in process memory,
+# so extra workers would each see their own copy. Raise WEB_CONCURRENCY once that state is shared.
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
 worker_class = "uvicorn.workers.UvicornWorker"
 worker_connections = 1000
-timeout = 30
-keepalive = 2
+# Large multipart uploads can take a while
+timeout = 60
+graceful_timeout = 30
+# Longer than a typical load balancer idle timeout, so clients reuse their TLS connections
+keepalive = 75
 
 # Restart workers after this many requests, to help prevent memory leaks
 max_requests = 1000
@@ -22,8 +27,33 @@ errorlog = "-"
 loglevel = "info"
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 
+# Send gunicorn and application logs through a queue written by a background thread,
+# so workers never block on the shared stdout pipe (see app/core/logging_config.py)
+logconfig_dict = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "generic": {"format": "%(asctime)s [%(process)d] [%(levelname)s] %(name)s: %(message)s"},
+        "access": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "queue": {"()": "app.core.logging_config.queue_handler", "formatter": "generic"},
+        "access_queue": {"()": "app.core.logging_config.queue_handler", "formatter": "access"},
+    },
+    "root": {"level": "INFO", "handlers": ["queue"]},
+    "loggers": {
+        "gunicorn.error": {"level": "INFO", "handlers": ["queue"], "propagate": False, "qualname": "gunicorn.error"},
+        "gunicorn.access": {"level": "INFO", "handlers": ["access_queue"], "propagate": False, "qualname": "gunicorn.access"},
+    },
+}
+
 # Process naming
 proc_name = 'krib-backend'
 
 # Application
 wsgi_app = "main:app"
+
+# Import the app once in the master and fork workers from it, so workers share its memory
+# copy-on-write and respawn quickly after max_requests. Anything holding sockets (S3, Redis)
+# is created per worker, lazily or in the app's lifespan, not at import time.
+preload_app = True
@@ -7,6 +7,8 @@ from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
 
@@ -15,6 +17,7 @@ load_dotenv()
 
 # Import our modules
 from app.core.config import settings
+from app.core.logging_config import setup_logging
 from app.core.database import init_db
 from app.core.redis_client import redis_client
 from app.core.monitoring import init_sentry, metrics_middleware, metrics_endpoint, health_check_with_metrics
@@ -24,32 +27,46 @@ from app.api.routes import agencies, applications, viewings  # New long-term ren
 from app.core.supabase_client import supabase_client
 from slowapi.errors import RateLimitExceeded
 
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI app
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀 Starting Krib AI Backend...")
+    # Log through a queue drained by a background thread so stdout writes never block the loop
+    setup_logging()
+    logger.info("Starting Krib AI Backend...")
     
     # Initialize Sentry error tracking
     init_sentry()
-    print("✅ Sentry error tracking initialized")
+    logger.info("Sentry error tracking initialized")
     
     await init_db()
-    print("✅ Database initialized")
+    logger.info("Database initialized")
     
     # Initialize Redis
     await redis_client.connect()
     if redis_client.is_connected:
-        print("✅ Redis cache connected")
+        logger.info("Redis cache connected")
     else:
-        print("⚠️ Redis cache unavailable - running without cache")
+        logger.warning("Redis cache unavailable - running without cache")
+    
+    # Check S3 in the background so a slow bucket probe doesn't hold up startup
+    from app.services.storage_service import storage_service
+    app.state.s3_check = asyncio.create_task(storage_service.verify_bucket())
     
     yield
     
     # Shutdown
-    print("🛑 Shutting down Krib AI Backend...")
+    logger.info("Shutting down Krib AI Backend...")
+    from app.services.docusign_service import docusign_service
+    await docusign_service.drain_pending_updates()
+    logger.info("Pending DocuSign updates flushed")
+    from app.services.google_calendar_service import google_calendar_service
+    await google_calendar_service.drain_pending_updates()
+    logger.info("Pending calendar updates flushed")
     await redis_client.disconnect()
-    print("✅ Redis connection closed")
+    logger.info("Redis connection closed")
 
 app = FastAPI(
     title="Krib AI API",
@@ -99,8 +99,8 @@ def check_supabase_connection():
     try:
         from app.core.supabase_client import supabase_client
         
-        # Test connection
-        result = supabase_client.table("users").select("count").execute()
+        # Test connection (HEAD request: only the row count comes back, no row data)
+        supabase_client.table("users").select("id", count="exact", head=True).execute()
         print("✅ Supabase connection successful")
         return True
     except Exception as e:
@@ -0,0 +1,11 @@
+-- =====================================================================
+-- KRIB AI - DOCUSIGN WEBHOOK LOOKUP INDEX
+-- Migration: Unique index for resolving webhooks to lease agreements
+-- Date: February 1, 2025
+-- =====================================================================
+
+-- DocuSign webhooks look up the lease by envelope ID on every event;
+-- each envelope belongs to exactly one lease agreement
+CREATE UNIQUE INDEX IF NOT EXISTS idx_leases_docusign_envelope_id
+    ON public.lease_agreements(docusign_envelope_id)
+    WHERE docusign_envelope_id IS NOT NULL;
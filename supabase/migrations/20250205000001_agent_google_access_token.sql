@@ -0,0 +1,16 @@
+-- =====================================================================
+-- KRIB AI - AGENT GOOGLE ACCESS TOKEN COLUMNS
+-- Migration: Store Google Calendar credentials for agents
+-- Date: February 5, 2025
+-- =====================================================================
+
+-- google_credentials holds the long-lived OAuth client details (refresh
+-- token, client id/secret, scopes) and is written once per connection
+ALTER TABLE public.agents
+    ADD COLUMN IF NOT EXISTS google_credentials TEXT;
+
+-- The short-lived access token is refreshed roughly hourly; keeping it in
+-- its own columns lets a refresh update two narrow fields
+ALTER TABLE public.agents
+    ADD COLUMN IF NOT EXISTS google_access_token TEXT,
+    ADD COLUMN IF NOT EXISTS google_access_token_expires_at TIMESTAMP WITH TIME ZONE;
@@ -0,0 +1,10 @@
+-- =====================================================================
+-- KRIB AI - AGENT AVAILABILITY SLOT KEY
+-- Migration: Unique slot key so calendar sync can upsert availability
+-- Date: February 6, 2025
+-- =====================================================================
+
+-- An agent has at most one availability slot starting at a given time;
+-- Google Calendar sync upserts on this key instead of delete + re-insert
+CREATE UNIQUE INDEX IF NOT EXISTS idx_availability_agent_slot
+    ON public.agent_availability(agent_id, date, start_time);